@@ -1,12 +1,28 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import gspread
 import base64
+import bisect
+import contextlib
+import functools
+import hashlib
+import itertools
 import pathlib
+import re
+import sqlite3
+import threading
+import time
+import html as _html
 import json as _json
+from collections import OrderedDict
 from google.oauth2.service_account import Credentials
+from gspread.utils import absolute_range_name
+from datetime import date, datetime, timedelta
 from streamlit_js_eval import streamlit_js_eval
 
+import zhihu_archive
+
 # ============================================================
 # Google Sheets 配置
 # ============================================================
@@ -16,6 +32,20 @@ SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
     "https://www.googleapis.com/auth/drive",
 ]
+# 每个表格中页面会用到的工作表：当前选项卡的工作表先取，其余在后台一次 batchGet 预取
+SPREADSHEET_SHEETS = {
+    FITNESS_SPREADSHEET_ID: ("周训练计划", "动作库", "身体状况与禁忌", "备注与说明", "训练笔记"),
+    TASK_SPREADSHEET_ID: ("Sheet1", "Archive"),
+}
+REVISION_CHECK_INTERVAL = 30  # 两次 Drive modifiedTime 探测的最小间隔（秒）
+GOOGLE_TIMEOUT = (5, 15)      # Google API 请求的（连接, 读取）超时（秒），连不上时尽快退回本地快照
+CACHE_DIR = pathlib.Path(__file__).parent / ".cache"
+SNAPSHOT_DB = CACHE_DIR / "sheets.sqlite3"
+RENDERER_VERSION = 2                       # 渲染逻辑改动时加一，使旧的 HTML 缓存失效
+RENDER_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 渲染结果缓存上限（按字符数估算）
+ARCHIVE_DEFAULT_DAYS = 90                  # 已完成选项卡默认显示最近多少天
+PAGE_SIZES = (20, 50, 100, 200)            # 长表分页可选的每页条数，默认第二项
+SEARCH_LIMIT = 30                          # 存档检索最多显示的条数
 
 st.set_page_config(page_title="我有一个计划", page_icon="icon.jpg", layout="wide")
 
@@ -27,24 +57,333 @@ st.set_page_config(page_title="我有一个计划", page_icon="icon.jpg", layout
 def _get_client() -> gspread.Client:
     conn_secrets = dict(st.secrets["connections"]["gsheets"])
     creds = Credentials.from_service_account_info(conn_secrets, scopes=SCOPES)
-    return gspread.authorize(creds)
+    gc = gspread.authorize(creds)
+    gc.http_client.set_timeout(GOOGLE_TIMEOUT)
+    return gc
+
+
+@st.cache_resource
+def _open_spreadsheet(_gc, spreadsheet_id):
+    """缓存 Spreadsheet 句柄，避免每次读取都 open_by_key 重新拉元数据"""
+    return _gc.open_by_key(spreadsheet_id)
 
 
-@st.cache_data(ttl=300)
-def load_sheet(_gc, spreadsheet_id, title):
-    sh = _gc.open_by_key(spreadsheet_id)
-    ws = sh.worksheet(title)
-    values = ws.get_all_values()
+def _values_to_df(values):
+    """首行作表头；batchGet 会省略行尾空单元格，先补齐成矩形（与 get_all_values 一致）"""
     if not values or len(values) < 2:
         return pd.DataFrame()
-    return pd.DataFrame(values[1:], columns=values[0])
+    width = max(len(row) for row in values)
+    rows = [row + [""] * (width - len(row)) for row in values]
+    return pd.DataFrame(rows[1:], columns=rows[0])
+
+
+@st.cache_resource
+def _sheet_store():
+    """进程级工作表缓存，跨会话共享。
+
+    lock 只保护 books 字典本身；每个表格各有两把锁：
+    "lock" 保护下面的字段，只在读写字段时短暂持有，网络请求期间从不持有；
+    "sync" 让同一表格同时只有一个刷新在跑，网络请求期间持有，页面读取缓存不需要它。
+
+    books: {spreadsheet_id: {"lock", "sync", "modified": Drive modifiedTime, "checked": 上次探测时间,
+                             "synced": 上次成功同步时间, "error": 上次后台刷新的错误,
+                             "refreshing": 是否有后台刷新在跑,
+                             "sheets": {title: {"digest": 内容哈希, "df": DataFrame}}}}
+    """
+    return {"lock": threading.Lock(), "books": {}}
+
+
+def _values_digest(values):
+    return hashlib.sha1(_json.dumps(values, ensure_ascii=False).encode()).hexdigest()
+
+
+def _sheet_entry(digest, values):
+    """内容哈希写进 df.attrs，随副本一起带出，供渲染缓存和周计划模型做键"""
+    df = _values_to_df(values)
+    df.attrs["digest"] = digest
+    return {"digest": digest, "df": df}
+
+
+# ---------- 本地快照（SQLite）：冷启动直接渲染，Google 不可用时兜底 ----------
+def _snapshot_conn():
+    CACHE_DIR.mkdir(exist_ok=True)
+    conn = sqlite3.connect(SNAPSHOT_DB)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS books (spreadsheet_id TEXT PRIMARY KEY, modified TEXT, synced_at REAL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sheets (spreadsheet_id TEXT, title TEXT, digest TEXT, "
+        "values_json TEXT, PRIMARY KEY (spreadsheet_id, title))"
+    )
+    return conn
+
+
+def _load_snapshot(spreadsheet_id, book):
+    try:
+        conn = _snapshot_conn()
+    except sqlite3.Error:
+        return
+    with contextlib.closing(conn), conn:  # with conn 只结束事务，连接要另外关闭
+        row = conn.execute(
+            "SELECT modified, synced_at FROM books WHERE spreadsheet_id = ?", (spreadsheet_id,)
+        ).fetchone()
+        if row is None:
+            return
+        book["modified"], book["synced"] = row
+        for title, digest, values_json in conn.execute(
+            "SELECT title, digest, values_json FROM sheets WHERE spreadsheet_id = ?", (spreadsheet_id,)
+        ):
+            book["sheets"][title] = _sheet_entry(digest, _json.loads(values_json))
+
+
+def _save_snapshot(spreadsheet_id, modified, synced, changed):
+    """changed: {title: (digest, values)}，只写入内容有变化的工作表"""
+    try:
+        conn = _snapshot_conn()
+    except sqlite3.Error:
+        return
+    with contextlib.closing(conn), conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO books VALUES (?, ?, ?)",
+            (spreadsheet_id, modified, synced),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO sheets VALUES (?, ?, ?, ?)",
+            [(spreadsheet_id, t, d, _json.dumps(v, ensure_ascii=False)) for t, (d, v) in changed.items()],
+        )
 
 
-def get_day_data(df):
-    """将周训练计划按训练日分组"""
+def _get_book(spreadsheet_id):
+    store = _sheet_store()
+    with store["lock"]:
+        book = store["books"].get(spreadsheet_id)
+        if book is None:
+            book = {"lock": threading.Lock(), "sync": threading.Lock(),
+                    "modified": None, "checked": 0.0, "synced": None, "error": None,
+                    "refreshing": False, "sheets": {}}
+            _load_snapshot(spreadsheet_id, book)
+            store["books"][spreadsheet_id] = book
+        return book
+
+
+def _probe_revision(gc, spreadsheet_id):
+    """读取 Drive modifiedTime：只返回元数据，比拉取整表便宜得多。失败返回 None（视为未知，需要重新拉取）"""
+    try:
+        meta = gc.http_client.get_file_drive_metadata(spreadsheet_id)
+    except Exception:
+        return None
+    return meta.get("modifiedTime")
+
+
+def _fetch_values(gc, spreadsheet_id, titles):
+    """一次 values.batchGet 取回多个工作表的原始值，返回 {title: [[...], ...]}"""
+    sh = _open_spreadsheet(gc, spreadsheet_id)
+    resp = sh.values_batch_get([absolute_range_name(t) for t in titles])
+    value_ranges = resp.get("valueRanges", [])
+    return {t: vr.get("values", []) for t, vr in zip(titles, value_ranges)}
+
+
+def _refresh_book(gc, spreadsheet_id, titles):
+    """按需刷新一个表格：modifiedTime 未变且工作表都在内存中时直接返回；
+    变了才重新拉取，并且只重建内容哈希发生变化的 DataFrame。
+
+    探测和 batchGet 都在锁外进行：请求前在锁内读出已缓存的版本和哈希，请求后再在锁内一次换上新结果，
+    Google 慢或连不上时，读取缓存的页面不会被卡住"""
+    book = _get_book(spreadsheet_id)
+    with book["sync"]:
+        with book["lock"]:
+            cached = {t: entry["digest"] for t, entry in book["sheets"].items()}
+            known_modified = book["modified"]
+            missing = [t for t in titles if t not in cached]
+            if not missing and time.time() - book["checked"] < REVISION_CHECK_INTERVAL:
+                return book
+
+        now = time.time()
+        modified = _probe_revision(gc, spreadsheet_id)
+        unchanged = modified is not None and modified == known_modified
+        fetched = {}
+        if not unchanged or missing:
+            # 表格有改动时，连同已缓存的其他工作表一起校验（仍是一次 batchGet）
+            fetch = missing if unchanged else list(dict.fromkeys([*titles, *cached]))
+            fetched = _fetch_values(gc, spreadsheet_id, fetch)
+        changed = {}
+        for title, values in fetched.items():
+            digest = _values_digest(values)
+            if cached.get(title) != digest:
+                changed[title] = (digest, values)
+        entries = {title: _sheet_entry(digest, values) for title, (digest, values) in changed.items()}
+
+        with book["lock"]:
+            book["sheets"].update(entries)
+            if fetched:
+                book["modified"] = modified
+            book["checked"] = now
+            book["synced"] = now
+            book["error"] = None
+            modified = book["modified"]
+        _save_snapshot(spreadsheet_id, modified, now, changed)
+        return book
+
+
+def _revalidate(gc, spreadsheet_id, titles):
+    book = _get_book(spreadsheet_id)
+    error = None
+    try:
+        _refresh_book(gc, spreadsheet_id, titles)
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    with book["lock"]:
+        if error:
+            book["error"] = error
+        book["refreshing"] = False
+
+
+def _revalidate_async(gc, spreadsheet_id, titles):
+    """stale-while-revalidate：先用内存/快照里的数据渲染，后台线程再去 Google 校验"""
+    book = _get_book(spreadsheet_id)
+    with book["lock"]:
+        if book["refreshing"] or time.time() - book["checked"] < REVISION_CHECK_INTERVAL:
+            return
+        book["refreshing"] = True
+    threading.Thread(target=_revalidate, args=(gc, spreadsheet_id, titles), daemon=True).start()
+
+
+def prefetch_sheets(gc, spreadsheet_id, titles):
+    """后台预取尚未缓存的工作表，当前选项卡渲染完之后调用，不阻塞页面"""
+    if gc is None:
+        return
+    book = _get_book(spreadsheet_id)
+    with book["lock"]:
+        missing = tuple(t for t in titles if t not in book["sheets"])
+        if not missing or book["refreshing"]:
+            return
+        book["refreshing"] = True
+    threading.Thread(target=_revalidate, args=(gc, spreadsheet_id, missing), daemon=True).start()
+
+
+def load_sheet(gc, spreadsheet_id, title, copy=True):
+    """只取这一个工作表（已缓存则后台校验）。gc 为 None（凭证不可用）时只读本地快照。
+    copy=False 直接返回跨会话共享的 DataFrame，调用方必须只读"""
+    book = _get_book(spreadsheet_id)
+    if title in book["sheets"]:
+        if gc is not None:
+            _revalidate_async(gc, spreadsheet_id, (title,))
+    elif gc is None:
+        raise RuntimeError(f"没有可用的 Google 凭证，也没有「{title}」的本地快照")
+    else:
+        _refresh_book(gc, spreadsheet_id, (title,))
+    # 缓存的 DataFrame 跨会话共享，默认返回副本，调用方可以原地修改
+    df = book["sheets"][title]["df"]
+    return df.copy() if copy else df
+
+
+def render_sync_status(spreadsheet_id):
+    """后台刷新失败（离线）时提示当前显示的是本地快照"""
+    book = _get_book(spreadsheet_id)
+    with book["lock"]:
+        error, synced = book["error"], book["synced"]
+    if error and synced:
+        synced = datetime.fromtimestamp(synced).strftime("%Y-%m-%d %H:%M")
+        st.caption(f"⚠️ 暂时无法连接 Google，显示本地快照 · 上次同步：{synced}")
+
+
+# ============================================================
+# 渲染结果缓存
+# ============================================================
+@st.cache_resource
+def _render_cache():
+    """LRU：(RENDERER_VERSION, 内容哈希, 视图/筛选条件...) -> 渲染好的 HTML"""
+    return {"lock": threading.Lock(), "entries": OrderedDict(), "size": 0, "hits": 0, "misses": 0}
+
+
+def _html_size(value):
+    if isinstance(value, str):
+        return len(value)
+    return sum(_html_size(v) for v in value)
+
+
+def cached_render(digest, key, build):
+    """digest 为工作表内容哈希，key 为视图和筛选条件（需可哈希）。
+    build() 返回 HTML 字符串或其嵌套元组；digest 为 None 时不缓存"""
+    if digest is None:
+        return build()
+    cache = _render_cache()
+    full_key = (RENDERER_VERSION, digest, *key)
+    with cache["lock"]:
+        if full_key in cache["entries"]:
+            cache["entries"].move_to_end(full_key)
+            cache["hits"] += 1
+            return cache["entries"][full_key][0]
+
+    value = build()
+    size = _html_size(value)
+    with cache["lock"]:
+        cache["misses"] += 1
+        if size <= RENDER_CACHE_MAX_BYTES and full_key not in cache["entries"]:
+            cache["entries"][full_key] = (value, size)
+            cache["size"] += size
+            while cache["size"] > RENDER_CACHE_MAX_BYTES:
+                _, (_, evicted) = cache["entries"].popitem(last=False)
+                cache["size"] -= evicted
+    return value
+
+
+def render_cache_stats():
+    cache = _render_cache()
+    with cache["lock"]:
+        total = cache["hits"] + cache["misses"]
+        return {
+            "hits": cache["hits"],
+            "misses": cache["misses"],
+            "hit_rate": cache["hits"] / total if total else 0.0,
+            "entries": len(cache["entries"]),
+            "size": cache["size"],
+        }
+
+
+@st.cache_resource(max_entries=4)
+def build_plan_model(digest, _df):
+    """周训练计划的只读模型：每个内容版本构建一次，所有会话、选项卡和设备模式共享，不要原地修改。
+
+    df: 训练日列已向下填充的整表；days: 训练日（按出现顺序）；
+    day_rows: {训练日: 整表行号数组}；day_frames: {训练日: 该日子表}；
+    phases: {训练日: {阶段: [(子表行号, 动作序号), ...]}}（跳过动作名称为空的行）
+    """
+    df = _df.copy()
     df.iloc[:, 0] = df.iloc[:, 0].replace("", pd.NA).ffill().fillna("")
-    days = df.iloc[:, 0].unique().tolist()
-    return {day: df[df.iloc[:, 0] == day].reset_index(drop=True) for day in days}
+    header = df.columns.tolist()
+    day_col = df.iloc[:, 0]
+    days = day_col.unique().tolist()
+    indices = df.groupby(day_col, sort=False).indices
+    day_rows = {day: indices[day] for day in days}
+
+    name_col = header.index("动作名称") if "动作名称" in header else -1
+    phase_col = header.index("阶段") if "阶段" in header else -1
+    day_frames, phases = {}, {}
+    for day, rows in day_rows.items():
+        frame = df.iloc[rows].reset_index(drop=True)
+        day_frames[day] = frame
+        names = frame.iloc[:, name_col].tolist() if name_col >= 0 else [""] * len(frame)
+        phase_vals = frame.iloc[:, phase_col].tolist() if phase_col >= 0 else [""] * len(frame)
+        by_phase = {}
+        exercise_num = 1
+        for i, (name, phase) in enumerate(zip(names, phase_vals)):
+            if not name.strip():
+                continue
+            by_phase.setdefault(phase.strip(), []).append((i, exercise_num))
+            exercise_num += 1
+        phases[day] = by_phase
+
+    return {"digest": digest, "df": df, "header": header, "days": days,
+            "day_rows": day_rows, "day_frames": day_frames, "phases": phases}
+
+
+def plan_rows(plan, days):
+    """选中训练日的行（保持原表顺序），直接按行号取，不复制整表也不再逐行比较"""
+    rows = [plan["day_rows"][d] for d in days if d in plan["day_rows"]]
+    if not rows:
+        return plan["df"].iloc[0:0]
+    return plan["df"].iloc[np.sort(np.concatenate(rows))]
 
 
 # ============================================================
@@ -97,17 +436,145 @@ STATUS_STYLE = {
 }
 
 
+# 合并单元格着色规则：(关键词..., (背景色, 文字色))，列表顺序即优先级（与原先 if/elif 链一致）
+CATEGORY_CELL_RULES = [
+    (("伤病", "🔴"), ("#fff0f0", "#c0392b")),
+    (("禁忌", "🚫", "⚠️"), ("#fff3e0", "#e65100")),
+    (("恢复", "🟢"), ("#e8f5e9", "#2e7d32")),
+    (("环境", "🟡"), ("#fffde7", "#f57f17")),
+    (("营养", "🔵"), ("#e3f2fd", "#1565c0")),
+    (("原则", "📋"), ("#f3e5f5", "#6a1b9a")),
+    (("练后拉伸",), ("#efebe9", "#5d4037")),
+    (("热身",), ("#e0f7fa", "#00695c")),
+    (("第7天", "完全休息"), ("#fce4ec", "#880e4f")),
+    (("第6天",), ("#f3e5f5", "#4a148c")),
+    (("第1天", "第5天"), ("#e8eaf6", "#283593")),
+    (("第2天",), ("#e0f2f1", "#004d40")),
+    (("第3天",), ("#f1f8e9", "#33691e")),
+    (("第4天",), ("#fff8e1", "#ff6f00")),
+]
+
+CELL_TYPE_COLORS = {"💪": "#1565c0", "🎯": "#e65100", "🔧": "#2e7d32", "🧘": "#6a1b9a"}
+RPE_HIGH = ("7-8", "8-9", "8")
+RPE_LOW = ("4-5", "4", "5", "5-6")
+
+
+def _compile_rules(keyword_groups):
+    """把按优先级排列的关键词组编译成一个正则，一次扫描找出所有命中的关键词。
+    返回 match(text) -> 命中的最高优先级组号（无命中为 None）"""
+    rank = {}
+    for i, keywords in enumerate(keyword_groups):
+        for kw in keywords:
+            rank.setdefault(kw, i)
+    # 零宽前瞻：每个位置都尝试匹配，关键词相互重叠时也不会漏掉
+    alternation = "|".join(re.escape(kw) for kw in sorted(rank, key=len, reverse=True))
+    pattern = re.compile(f"(?=({alternation}))")
+
+    def match(text):
+        return min((rank[kw] for kw in pattern.findall(text)), default=None)
+
+    return match
+
+
+_match_category = _compile_rules([keywords for keywords, _ in CATEGORY_CELL_RULES])
+_match_cell_type = _compile_rules([(emoji,) for emoji in CELL_TYPE_COLORS])
+_match_badge_type = _compile_rules([(emoji,) for emoji in TYPE_BADGES])
+_BADGE_TYPE_EMOJIS = list(TYPE_BADGES)
+
+
+@functools.lru_cache(maxsize=1024)
+def _type_emoji(action_type: str):
+    """动作类型里出现的 TYPE_BADGES 表情（按字典顺序取第一个），没有则 None"""
+    idx = _match_badge_type(str(action_type))
+    return None if idx is None else _BADGE_TYPE_EMOJIS[idx]
+
+
+@functools.lru_cache(maxsize=1024)
 def _get_type_badge(action_type: str) -> str:
-    for emoji, (label, color, bg) in TYPE_BADGES.items():
-        if emoji in str(action_type):
-            return f'<span style="display:inline-block;padding:2px 8px;border-radius:12px;font-size:12px;font-weight:600;color:{color};background:{bg};">{emoji} {label}</span>'
+    emoji = _type_emoji(action_type)
+    if emoji is not None:
+        label = TYPE_BADGES[emoji][0]
+        return _badge(f"{emoji} {label}", f"tb{_BADGE_TYPE_EMOJIS.index(emoji)}")
     if action_type.strip():
-        return f'<span style="display:inline-block;padding:2px 8px;border-radius:12px;font-size:12px;background:#f5f5f5;">{action_type}</span>'
+        return f'<span class="fit-badge">{action_type}</span>'
     return ""
 
 
-def _badge(text, color, bg):
-    return f'<span style="display:inline-block;padding:2px 8px;border-radius:12px;font-size:12px;font-weight:600;color:{color};background:{bg};">{text}</span>'
+def _badge(text, modifier=""):
+    """modifier 为样式表中生成的配色类名（见 _component_css）"""
+    return f'<span class="fit-badge strong {modifier}">{text}</span>'
+
+
+# ============================================================
+# 组件样式表：由上面的样式映射生成，随 GLOBAL_CSS 注入一次，
+# 渲染函数只输出短类名，不再在每个元素上重复内联 style
+# ============================================================
+def _component_css() -> str:
+    rules = [
+        # 徽章
+        ".fit-badge{display:inline-block;padding:2px 8px;border-radius:12px;font-size:12px;background:#f5f5f5;}",
+        ".fit-badge.strong{font-weight:600;}",
+        # 卡片
+        ".fit-card{background:white;border-radius:10px;padding:10px 12px;margin-bottom:8px;"
+        "box-shadow:0 1px 3px rgba(0,0,0,0.05);border:1px solid #f0f0f0;}",
+        ".fit-card.r8{border-radius:8px;}",
+        ".fit-card-head{display:flex;justify-content:space-between;align-items:center;margin-bottom:2px;}",
+        ".fit-card.lib .fit-card-head{margin-bottom:3px;}",
+        ".fit-card-title{font-size:14px;font-weight:600;color:#2c3e50;}",
+        ".fit-sets{font-size:13px;color:#34495e;font-weight:500;margin-bottom:2px;}",
+        ".fit-meta{display:flex;flex-wrap:wrap;gap:8px;margin-bottom:2px;}",
+        ".fit-aux{font-size:12px;color:#7f8c8d;}",
+        ".fit-aux.progress{margin-bottom:2px;font-style:italic;}",
+        ".fit-aux.muscle{margin-bottom:3px;}",
+        ".fit-rpe{font-size:13px;color:#666;}",
+        ".fit-note{font-size:12px;color:#5d6d7e;background:#f8f9fa;padding:6px 10px;border-radius:6px;"
+        "margin-top:4px;line-height:1.4;border:1px solid #eee;}",
+        ".fit-note.warn{color:#e74c3c;background:#fff5f5;border-color:#ffdada;}",
+        ".fit-card.lib .fit-note{margin-top:0;}",
+        ".fit-phase-hdr{font-size:14px;font-weight:600;color:#333;padding:6px 0 4px 0;"
+        "border-bottom:1px solid #ddd;margin:10px 0 6px 0;}",
+        # 身体状况
+        ".fit-cat-hdr{background:#f1f3f5;padding:6px 12px;border-radius:6px;margin:10px 0 6px 0;"
+        "font-size:13px;font-weight:600;color:#2c3e50;}",
+        ".fit-item{background:white;padding:8px 12px;margin-bottom:6px;border-radius:6px;border:1px solid #f0f0f0;}",
+        ".fit-item-title{font-size:13px;font-weight:600;color:#2c3e50;margin-bottom:2px;}",
+        ".fit-item-detail{font-size:12px;color:#5d6d7e;line-height:1.4;}",
+        # 训练笔记
+        ".fit-pill{font-size:11px;padding:2px 6px;border-radius:4px;background:#f1f3f5;color:#34495e;font-weight:600;}",
+        ".fit-note-meta{font-size:11px;color:#95a5a6;margin-bottom:6px;}",
+        ".fit-problem{font-size:12px;color:#e74c3c;background:#fff5f5;padding:6px 10px;border-radius:6px;"
+        "margin-bottom:4px;line-height:1.4;border:1px solid #ffdada;}",
+        ".fit-fix{font-size:12px;color:#27ae60;background:#f4fbf7;padding:6px 10px;border-radius:6px;"
+        "line-height:1.4;border:1px solid #d4f2e1;}",
+        # 备注
+        ".fit-topic{margin-bottom:6px;}",
+        ".fit-topic-title{font-weight:600;font-size:14px;color:#333;}",
+        ".fit-topic-body{font-size:13px;color:#666;}",
+        # 任务卡片
+        ".task-cat{background:#f5f7fa;padding:8px 12px;border-radius:6px;margin:12px 0 6px 0;"
+        "font-size:14px;font-weight:600;color:#333;}",
+        ".task-card{background:white;border-left:2px solid #ddd;padding:8px 12px;margin-bottom:6px;border-radius:4px;}",
+        ".task-field{font-size:14px;color:#444;margin-bottom:2px;}",
+        # 表格单元格
+        ".fit-table td.merged-cell.cat{background-color:#fafafa;}",
+        "span.rpe-hi{color:#c62828;font-weight:bold;}",
+        "span.rpe-lo{color:#2e7d32;}",
+    ]
+    for i, (_, color, bg) in enumerate(TYPE_BADGES.values()):
+        rules.append(f".fit-badge.tb{i}{{color:{color};background:{bg};}}")
+    for i, (color, bg) in enumerate(CATEGORY_COLORS.values()):
+        rules.append(f".fit-cat-hdr.bc{i}{{color:{color};background:{bg};}}")
+    for i, (color, bg) in enumerate(PRIORITY_STYLE.values()):
+        rules.append(f".fit-pill.pri{i}{{color:{color};background:{bg};}}")
+    for i, (_, (bg, color)) in enumerate(CATEGORY_CELL_RULES):
+        rules.append(f".fit-table td.merged-cell.cat{i}{{background-color:{bg};color:{color};}}")
+    for i, color in enumerate(CELL_TYPE_COLORS.values()):
+        rules.append(f"span.ct{i}{{color:{color};font-weight:600;}}")
+    return "\n".join(rules) + "\n"
+
+
+_CATEGORY_COLOR_CLASS = {cat: f"bc{i}" for i, cat in enumerate(CATEGORY_COLORS)}
+_PRIORITY_CLASS = {p: f"pri{i}" for i, p in enumerate(PRIORITY_STYLE)}
 
 
 # ============================================================
@@ -123,92 +590,75 @@ def render_mobile_exercise_card(row, header, index):
     note = row[header.index("注意事项")] if "注意事项" in header else ""
     phase = row[header.index("阶段")] if "阶段" in header else ""
 
-    border_color = "#ddd"
-    for emoji, (_, color, _) in TYPE_BADGES.items():
-        if emoji in str(action_type):
-            border_color = color
-            break
-
     badge = _get_type_badge(action_type)
 
     rpe_html = ""
     if rpe.strip():
-        rpe_html = f'<span style="font-size:13px;color:#666;">RPE {rpe}</span>'
+        rpe_html = f'<span class="fit-rpe">RPE {rpe}</span>'
 
     has_warning = "⚠️" in note
-    warning_border = "border-left:4px solid #ff9800;" if has_warning else f"border-left:4px solid {border_color};"
 
     card_html = f'''
-    <div style="{warning_border}background:white;border-radius:10px;padding:10px 12px;margin-bottom:8px;box-shadow:0 1px 3px rgba(0,0,0,0.05);border:1px solid #f0f0f0;">
-        <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:2px;">
-            <span style="font-size:14px;font-weight:600;color:#2c3e50;">{index}. {name}</span>
+    <div class="fit-card">
+        <div class="fit-card-head">
+            <span class="fit-card-title">{index}. {name}</span>
             {badge}
         </div>'''
 
     if sets.strip():
-        card_html += f'<div style="font-size:13px;color:#34495e;font-weight:500;margin-bottom:2px;">{sets}</div>'
-    
+        card_html += f'<div class="fit-sets">{sets}</div>'
+
     # 辅助信息容器
-    card_html += '<div style="display:flex;flex-wrap:wrap;gap:8px;margin-bottom:2px;">'
+    card_html += '<div class="fit-meta">'
     if tempo.strip():
-        card_html += f'<div style="font-size:12px;color:#7f8c8d;">⏱️ {tempo}</div>'
+        card_html += f'<div class="fit-aux">⏱️ {tempo}</div>'
     if rpe_html:
-        card_html += f'<div style="font-size:12px;color:#7f8c8d;">{rpe_html}</div>'
+        card_html += f'<div class="fit-aux">{rpe_html}</div>'
     card_html += '</div>'
 
     if progression.strip():
-        card_html += f'<div style="font-size:12px;color:#7f8c8d;margin-bottom:2px;font-style:italic;">📈 {progression}</div>'
-    
+        card_html += f'<div class="fit-aux progress">📈 {progression}</div>'
+
     if note.strip():
-        note_bg = "#fff5f5" if has_warning else "#f8f9fa"
-        note_color = "#e74c3c" if has_warning else "#5d6d7e"
-        card_html += f'<div style="font-size:12px;color:{note_color};background:{note_bg};padding:6px 10px;border-radius:6px;margin-top:4px;line-height:1.4;border:1px solid {"#ffdada" if has_warning else "#eee"};">{note}</div>'
+        card_html += f'<div class="fit-note{" warn" if has_warning else ""}">{note}</div>'
 
     card_html += '</div>'
     return card_html
 
 
-def render_mobile_day(day_name, day_df, header, use_phase_tabs=True):
-    """渲染手机端训练日内容。use_phase_tabs=True 时按阶段分子选项卡"""
-    phase_col = header.index("阶段") if "阶段" in header else -1
+def _mobile_day_phases(plan, day_name):
+    """按阶段收集动作卡片 HTML：((phase_name, (card_html, ...)), ...)，保留所有阶段，不过滤"""
+    rows = plan["day_frames"][day_name].values.tolist()
+    header = plan["header"]
+    return tuple(
+        (phase, tuple(render_mobile_exercise_card(rows[i], header, num) for i, num in items))
+        for phase, items in plan["phases"][day_name].items()
+    )
 
-    # 收集各阶段的动作（保留所有阶段，不过滤）
-    phases = {}  # {phase_name: [(row, index), ...]}
-    exercise_num = 1
-    for _, row_series in day_df.iterrows():
-        row = row_series.tolist()
-        phase = row[phase_col].strip() if phase_col >= 0 else ""
-        name = row[header.index("动作名称")] if "动作名称" in header else ""
-        if not name.strip():
-            continue
-        if phase not in phases:
-            phases[phase] = []
-        phases[phase].append((row, exercise_num))
-        exercise_num += 1
 
-    phase_names = [p for p in phases.keys() if p]
+def render_mobile_day(plan, day_name, use_phase_tabs=True):
+    """渲染手机端训练日内容。use_phase_tabs=True 时按阶段分子选项卡"""
+    phases = cached_render(plan["digest"], ("mobile_day", day_name), lambda: _mobile_day_phases(plan, day_name))
+    phase_names = [p for p, _ in phases if p]
 
     # 如果有多个阶段且启用子选项卡，用 st.tabs
     if use_phase_tabs and len(phase_names) > 1:
+        cards_by_phase = dict(phases)
         sub_tabs = st.tabs(phase_names)
         for phase_name, sub_tab in zip(phase_names, sub_tabs):
             with sub_tab:
-                _render_phase_cards(phases[phase_name], header)
+                _render_phase_cards(cards_by_phase[phase_name])
     else:
         # 单阶段或不分 tab，直接渲染
-        for phase_name, items in phases.items():
+        for phase_name, cards in phases:
             if phase_name and len(phases) > 1:
-                st.markdown(
-                    f'<div style="font-size:14px;font-weight:600;color:#333;padding:6px 0 4px 0;border-bottom:1px solid #ddd;margin:10px 0 6px 0;">{phase_name}</div>',
-                    unsafe_allow_html=True,
-                )
-            _render_phase_cards(items, header)
+                st.markdown(f'<div class="fit-phase-hdr">{phase_name}</div>', unsafe_allow_html=True)
+            _render_phase_cards(cards)
 
 
-def _render_phase_cards(items, header):
+def _render_phase_cards(cards):
     """渲染一个阶段内的所有动作卡片"""
-    for row, idx in items:
-        card = render_mobile_exercise_card(row, header, idx)
+    for card in cards:
         st.markdown(card, unsafe_allow_html=True)
 
 
@@ -222,17 +672,14 @@ def render_mobile_body(df):
 
         if cat != current_cat:
             current_cat = cat
-            color, bg = CATEGORY_COLORS.get(cat, ("#2c3e50", "#f1f3f5"))
-            st.markdown(
-                f'<div style="background:{bg};padding:6px 12px;border-radius:6px;margin:10px 0 6px 0;font-size:13px;font-weight:600;color:{color};">{cat}</div>',
-                unsafe_allow_html=True,
-            )
+            color_class = _CATEGORY_COLOR_CLASS.get(cat, "")
+            st.markdown(f'<div class="fit-cat-hdr {color_class}">{cat}</div>', unsafe_allow_html=True)
 
         if item.strip():
             st.markdown(
-                f'''<div style="background:white;border-left:2px solid #ddd;padding:8px 12px;margin-bottom:6px;border-radius:6px;border:1px solid #f0f0f0;">
-                    <div style="font-size:13px;font-weight:600;color:#2c3e50;margin-bottom:2px;">{item}</div>
-                    <div style="font-size:12px;color:#5d6d7e;line-height:1.4;">{detail}</div>
+                f'''<div class="fit-item">
+                    <div class="fit-item-title">{item}</div>
+                    <div class="fit-item-detail">{detail}</div>
                 </div>''',
                 unsafe_allow_html=True,
             )
@@ -247,13 +694,13 @@ def render_mobile_lib(df):
         badge = _get_type_badge(atype)
 
         st.markdown(
-            f'''<div style="background:white;border-radius:8px;padding:10px 12px;margin-bottom:8px;box-shadow:0 1px 3px rgba(0,0,0,0.05);border:1px solid #f0f0f0;">
-                <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:3px;">
-                    <span style="font-size:14px;font-weight:600;color:#2c3e50;">{name}</span>
+            f'''<div class="fit-card r8 lib">
+                <div class="fit-card-head">
+                    <span class="fit-card-title">{name}</span>
                     {badge}
                 </div>
-                {f'<div style="font-size:12px;color:#7f8c8d;margin-bottom:3px;">🎯 {muscle}</div>' if muscle.strip() else ""}
-                <div style="font-size:12px;color:#5d6d7e;line-height:1.4;background:#f8f9fa;padding:6px 10px;border-radius:6px;border:1px solid #eee;">{note}</div>
+                {f'<div class="fit-aux muscle">🎯 {muscle}</div>' if muscle.strip() else ""}
+                <div class="fit-note">{note}</div>
             </div>''',
             unsafe_allow_html=True,
         )
@@ -268,18 +715,17 @@ def render_mobile_notes(df):
         priority = str(row.get("优先级", "")).strip()
         status = str(row.get("状态", "")).strip()
 
-        p_color, p_bg = PRIORITY_STYLE.get(priority, ("#34495e", "#f1f3f5"))
-        s_color, s_bg = STATUS_STYLE.get(status, ("#34495e", "#f1f3f5"))
+        priority_class = _PRIORITY_CLASS.get(priority, "")
 
         card = f'''
-        <div style="border-left:3px solid {p_color};background:white;border-radius:8px;padding:10px 12px;margin-bottom:8px;box-shadow:0 1px 3px rgba(0,0,0,0.05);border:1px solid #f0f0f0;">
-            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:2px;">
-                <span style="font-size:14px;font-weight:600;color:#2c3e50;">{name}</span>
-                <span style="font-size:11px;padding:2px 6px;border-radius:4px;background:{p_bg};color:{p_color};font-weight:600;">{priority}</span>
+        <div class="fit-card r8">
+            <div class="fit-card-head">
+                <span class="fit-card-title">{name}</span>
+                <span class="fit-pill {priority_class}">{priority}</span>
             </div>
-            <div style="font-size:11px;color:#95a5a6;margin-bottom:6px;">{date} · {status}</div>
-            <div style="font-size:12px;color:#e74c3c;background:#fff5f5;padding:6px 10px;border-radius:6px;margin-bottom:4px;line-height:1.4;border:1px solid #ffdada;">{problem}</div>
-            <div style="font-size:12px;color:#27ae60;background:#f4fbf7;padding:6px 10px;border-radius:6px;line-height:1.4;border:1px solid #d4f2e1;">{fix}</div>
+            <div class="fit-note-meta">{date} · {status}</div>
+            <div class="fit-problem">{problem}</div>
+            <div class="fit-fix">{fix}</div>
         </div>'''
         st.markdown(card, unsafe_allow_html=True)
 
@@ -287,191 +733,633 @@ def render_mobile_notes(df):
 # ============================================================
 # 电脑端：表格渲染
 # ============================================================
-def render_table_with_rowspan(df: pd.DataFrame, merge_col: int = 0) -> str:
-    if df.empty:
-        return "<p>无数据</p>"
+def _render_table_html(df: pd.DataFrame, merge_col=None, merge_class=None, style_cells=True) -> str:
+    """表格渲染引擎：按列取值、按列着色，合并列做游程分组。
+
+    merge_col: 需要 rowspan 合并的列号（None 表示不合并）；merge_class(val) 给出合并单元格的配色类名
+    style_cells: 是否对普通单元格套用 _style_cell（同一列的相同值只计算一次）
+    """
+    n = len(df)
+    columns = df.columns.tolist()
+    html = ['<table class="fit-table"><thead><tr>']
+    html.extend(f'<th>{col}</th>' for col in columns)
+    html.append('</tr></thead><tbody>')
 
-    html = ['<table class="fit-table">']
-    html.append('<thead><tr>')
-    for col in df.columns:
-        html.append(f'<th>{col}</th>')
-    html.append('</tr></thead>')
-
-    html.append('<tbody>')
-    first_col = df.iloc[:, merge_col].tolist()
-    i = 0
-    while i < len(df):
-        curr_val = first_col[i]
-        span = 1
-        while i + span < len(df) and first_col[i + span] == curr_val:
-            span += 1
-
-        html.append('<tr>')
-        for j in range(len(df.columns)):
-            if j == merge_col:
-                css = _get_category_css(curr_val)
-                html.append(f'<td rowspan="{span}" class="merged-cell" {css}>{curr_val}</td>')
-            else:
-                cell = str(df.iloc[i, j])
-                cell = _style_cell(cell, df.columns[j])
-                html.append(f'<td>{cell}</td>')
-        html.append('</tr>')
-
-        for k in range(1, span):
-            html.append('<tr>')
-            for j in range(len(df.columns)):
-                if j == merge_col:
-                    continue
-                cell = str(df.iloc[i + k, j])
-                cell = _style_cell(cell, df.columns[j])
-                html.append(f'<td>{cell}</td>')
-            html.append('</tr>')
-
-        i += span
+    # 普通列：整列转成 <td> 字符串
+    left, right = [], []
+    for j, col_name in enumerate(columns):
+        if j == merge_col:
+            continue
+        values = [str(v) for v in df.iloc[:, j].tolist()]
+        if style_cells:
+            styled = {}
+            for v in set(values):
+                styled[v] = f'<td>{_style_cell(v, col_name)}</td>'
+            cells = [styled[v] for v in values]
+        else:
+            cells = [f'<td>{v}</td>' for v in values]
+        (left if merge_col is not None and j < merge_col else right).append(cells)
+    left_rows = [''.join(r) for r in zip(*left)] if left else [''] * n
+    right_rows = [''.join(r) for r in zip(*right)] if right else [''] * n
+
+    if merge_col is None:
+        html.extend(f'<tr>{r}</tr>' for r in right_rows)
+    else:
+        # 游程分组：相邻相同值合并为一个 rowspan 单元格
+        first_col = df.iloc[:, merge_col].tolist()
+        starts = [i for i in range(n) if i == 0 or first_col[i] != first_col[i - 1]]
+        ends = starts[1:] + [n]
+        for start, end in zip(starts, ends):
+            val = first_col[start]
+            html.append(
+                f'<tr>{left_rows[start]}<td rowspan="{end - start}" class="merged-cell {merge_class(val)}">{val}</td>'
+                f'{right_rows[start]}</tr>'
+            )
+            html.extend(f'<tr>{left_rows[k]}{right_rows[k]}</tr>' for k in range(start + 1, end))
 
     html.append('</tbody></table>')
     return ''.join(html)
 
 
-def render_simple_table(df: pd.DataFrame) -> str:
+def render_table_with_rowspan(df: pd.DataFrame, merge_col: int = 0) -> str:
     if df.empty:
         return "<p>无数据</p>"
+    return _render_table_html(df, merge_col=merge_col, merge_class=_get_category_class)
 
-    html = ['<table class="fit-table">']
-    html.append('<thead><tr>')
-    for col in df.columns:
-        html.append(f'<th>{col}</th>')
-    html.append('</tr></thead><tbody>')
-
-    for i in range(len(df)):
-        html.append('<tr>')
-        for j in range(len(df.columns)):
-            cell = str(df.iloc[i, j])
-            cell = _style_cell(cell, df.columns[j])
-            html.append(f'<td>{cell}</td>')
-        html.append('</tr>')
 
-    html.append('</tbody></table>')
-    return ''.join(html)
+def render_simple_table(df: pd.DataFrame) -> str:
+    if df.empty:
+        return "<p>无数据</p>"
+    return _render_table_html(df)
 
 
-def _get_category_css(val: str) -> str:
-    val = str(val)
-    if "伤病" in val or "🔴" in val:
-        return 'style="background-color:#fff0f0; color:#c0392b;"'
-    elif "禁忌" in val or "🚫" in val or "⚠️" in val:
-        return 'style="background-color:#fff3e0; color:#e65100;"'
-    elif "恢复" in val or "🟢" in val:
-        return 'style="background-color:#e8f5e9; color:#2e7d32;"'
-    elif "环境" in val or "🟡" in val:
-        return 'style="background-color:#fffde7; color:#f57f17;"'
-    elif "营养" in val or "🔵" in val:
-        return 'style="background-color:#e3f2fd; color:#1565c0;"'
-    elif "原则" in val or "📋" in val:
-        return 'style="background-color:#f3e5f5; color:#6a1b9a;"'
-    elif "练后拉伸" in val:
-        return 'style="background-color:#efebe9; color:#5d4037;"'
-    elif "热身" in val:
-        return 'style="background-color:#e0f7fa; color:#00695c;"'
-    elif "第7天" in val or "完全休息" in val:
-        return 'style="background-color:#fce4ec; color:#880e4f;"'
-    elif "第6天" in val:
-        return 'style="background-color:#f3e5f5; color:#4a148c;"'
-    elif "第1天" in val or "第5天" in val:
-        return 'style="background-color:#e8eaf6; color:#283593;"'
-    elif "第2天" in val:
-        return 'style="background-color:#e0f2f1; color:#004d40;"'
-    elif "第3天" in val:
-        return 'style="background-color:#f1f8e9; color:#33691e;"'
-    elif "第4天" in val:
-        return 'style="background-color:#fff8e1; color:#ff6f00;"'
-    return 'style="background-color:#fafafa;"'
+@functools.lru_cache(maxsize=4096)
+def _get_category_class(val: str) -> str:
+    idx = _match_category(str(val))
+    return f"cat{idx}" if idx is not None else "cat"
 
 
+@functools.lru_cache(maxsize=16384)
 def _style_cell(cell: str, col_name: str) -> str:
-    if "💪" in cell:
-        return f'<span style="color:#1565c0; font-weight:600;">{cell}</span>'
-    elif "🎯" in cell:
-        return f'<span style="color:#e65100; font-weight:600;">{cell}</span>'
-    elif "🔧" in cell:
-        return f'<span style="color:#2e7d32; font-weight:600;">{cell}</span>'
-    elif "🧘" in cell:
-        return f'<span style="color:#6a1b9a; font-weight:600;">{cell}</span>'
+    idx = _match_cell_type(cell)
+    if idx is not None:
+        return f'<span class="ct{idx}">{cell}</span>'
     if col_name == "目标RPE":
         cell = cell.strip()
-        if cell in ("7-8", "8-9", "8"):
-            return f'<span style="color:#c62828; font-weight:bold;">{cell}</span>'
-        elif cell in ("4-5", "4", "5", "5-6"):
-            return f'<span style="color:#2e7d32;">{cell}</span>'
+        if cell in RPE_HIGH:
+            return f'<span class="rpe-hi">{cell}</span>'
+        elif cell in RPE_LOW:
+            return f'<span class="rpe-lo">{cell}</span>'
     return cell
 
 
 # ============================================================
 # 任务清单：表格渲染
 # ============================================================
-def render_task_table(df: pd.DataFrame, title: str, is_mobile: bool) -> None:
+def _task_cards_html(df: pd.DataFrame) -> tuple:
+    """手机端任务卡片：按大类依次输出分组标题和卡片"""
+    df.iloc[:, 0] = df.iloc[:, 0].replace("", pd.NA).ffill().fillna("")
+    blocks = []
+    current_cat = ""
+    for _, row in df.iterrows():
+        cat = str(row.iloc[0])
+        if cat != current_cat:
+            current_cat = cat
+            blocks.append(f'<div class="task-cat">{cat}</div>')
+        # 显示其余列
+        card_content = ""
+        for j in range(1, len(df.columns)):
+            col_name = df.columns[j]
+            val = str(row.iloc[j]).strip()
+            if val:
+                card_content += f'<div class="task-field"><b>{col_name}</b>：{val}</div>'
+        if card_content:
+            blocks.append(f'<div class="task-card">{card_content}</div>')
+    return tuple(blocks)
+
+
+def _task_table_html(df: pd.DataFrame) -> str:
+    df.iloc[:, 0] = df.iloc[:, 0].replace("", pd.NA).ffill().fillna("")
+    return _render_table_html(
+        df, merge_col=0, merge_class=lambda _: "cat", style_cells=False,
+    )
+
+
+def render_task_table(df: pd.DataFrame, title: str, is_mobile: bool, key: tuple = ()) -> None:
+    """key：df 是整表的一个切片时，用切片条件区分渲染缓存"""
     if df.empty:
         st.info("无数据")
         return
 
+    digest = df.attrs.get("digest")
     if is_mobile:
         # 手机端：卡片式
-        df.iloc[:, 0] = df.iloc[:, 0].replace("", pd.NA).ffill().fillna("")
-        current_cat = ""
-        for _, row in df.iterrows():
-            cat = str(row.iloc[0])
-            if cat != current_cat:
-                current_cat = cat
-                st.markdown(
-                    f'<div style="background:#f5f7fa;padding:8px 12px;border-radius:6px;margin:12px 0 6px 0;font-size:14px;font-weight:600;color:#333;">{cat}</div>',
-                    unsafe_allow_html=True,
-                )
-            # 显示其余列
-            card_content = ""
-            for j in range(1, len(df.columns)):
-                col_name = df.columns[j]
-                val = str(row.iloc[j]).strip()
-                if val:
-                    card_content += f'<div style="font-size:14px;color:#444;margin-bottom:2px;"><b>{col_name}</b>：{val}</div>'
-            if card_content:
-                st.markdown(
-                    f'<div style="background:white;border-left:2px solid #ddd;padding:8px 12px;margin-bottom:6px;border-radius:4px;">{card_content}</div>',
-                    unsafe_allow_html=True,
-                )
+        for block in cached_render(digest, ("task", title, True, *key), lambda: _task_cards_html(df)):
+            st.markdown(block, unsafe_allow_html=True)
     else:
         # 电脑端：表格
-        df.iloc[:, 0] = df.iloc[:, 0].replace("", pd.NA).ffill().fillna("")
-        html = ['<table class="fit-table">']
-        html.append('<thead><tr>')
-        for col in df.columns:
-            html.append(f'<th>{col}</th>')
-        html.append('</tr></thead>')
-
-        html.append('<tbody>')
-        first_col = df.iloc[:, 0].tolist()
-        i = 0
-        while i < len(df):
-            curr_val = first_col[i]
-            span = 1
-            while i + span < len(df) and first_col[i + span] == curr_val:
-                span += 1
-
-            html.append('<tr>')
-            html.append(f'<td rowspan="{span}" class="merged-cell" style="background-color:#fafafa;">{curr_val}</td>')
-            for j in range(1, len(df.columns)):
-                html.append(f'<td>{df.iloc[i, j]}</td>')
-            html.append('</tr>')
-
-            for k in range(1, span):
-                html.append('<tr>')
-                for j in range(1, len(df.columns)):
-                    html.append(f'<td>{df.iloc[i + k, j]}</td>')
-                html.append('</tr>')
-
-            i += span
-
-        html.append('</tbody></table>')
-        st.markdown(''.join(html), unsafe_allow_html=True)
+        html = cached_render(digest, ("task", title, False, *key), lambda: _task_table_html(df))
+        st.markdown(html, unsafe_allow_html=True)
+
+
+# ============================================================
+# 任务清单：归档索引
+# ============================================================
+ARCHIVE_HEADER = ["大类任务", "描述", "完成日期"]
+_CATEGORY_PREFIX_RE = re.compile(r"^任务[一二三四五六七八九十\d]+[：:]\s*")
+_DONE_DATE_RE = re.compile(r"(\d{4})\D(\d{1,2})\D(\d{1,2})")
+
+
+def _df_values(df):
+    """DataFrame -> batchGet 形式的原始值（_values_to_df 的逆操作：去掉补齐的行尾空单元格）"""
+    if df.columns.empty:
+        return []
+
+    def trim(row):
+        while row and row[-1] == "":
+            row.pop()
+        return row
+
+    return [trim(df.columns.tolist())] + [trim(row) for row in df.to_numpy().tolist()]
+
+
+def _done_ordinal(value):
+    """完成日期 -> 日序数；2025/1/5、2025-01-05 等写法视为同一天，解析不了返回 0（排在最后）"""
+    m = _DONE_DATE_RE.search(value or "")
+    if not m:
+        return 0
+    try:
+        return date(*map(int, m.groups())).toordinal()
+    except ValueError:
+        return 0
+
+
+def _cell(row, i):
+    return row[i] if len(row) > i else ""
+
+
+@st.cache_resource
+def _archive_store():
+    """进程级归档索引，跨会话共享。
+
+    books: {spreadsheet_id: {"digest": 对应 Archive 工作表的内容哈希, "header": 表头（空表为 []),
+                             "keys": [(-日序数, 序号), ...] 升序，即完成日期倒序,
+                             "rows": 与 keys 一一对应的原始行, "seen": {(描述, 日序数)},
+                             "low": 已用过的最小序号}}
+    序号：重建时为行在表中的位置；合并进来的新行取更小的值，排在同一天已有行之前
+    """
+    return {"lock": threading.Lock(), "books": {}}
+
+
+def _archive_conn():
+    conn = _snapshot_conn()
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS archive_index (spreadsheet_id TEXT PRIMARY KEY, digest TEXT, "
+        "header_json TEXT, low INTEGER)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS archive_rows (spreadsheet_id TEXT, ord INTEGER, rank INTEGER, "
+        "row_json TEXT, PRIMARY KEY (spreadsheet_id, ord, rank))"
+    )
+    return conn
+
+
+def _build_archive_index(digest, values):
+    entries = sorted(
+        ((-_done_ordinal(_cell(row, 2)), i), row) for i, row in enumerate(values[1:])
+    )
+    return {
+        "digest": digest,
+        "header": values[0] if values else [],
+        "keys": [key for key, _ in entries],
+        "rows": [row for _, row in entries],
+        "seen": {(_cell(row, 1), -key[0]) for key, row in entries},
+        "low": 0,
+    }
+
+
+def _load_archive_index(spreadsheet_id):
+    try:
+        conn = _archive_conn()
+    except sqlite3.Error:
+        return None
+    with conn:
+        meta = conn.execute(
+            "SELECT digest, header_json, low FROM archive_index WHERE spreadsheet_id = ?", (spreadsheet_id,)
+        ).fetchone()
+        rows = conn.execute(
+            "SELECT ord, rank, row_json FROM archive_rows WHERE spreadsheet_id = ? ORDER BY ord DESC, rank",
+            (spreadsheet_id,),
+        ).fetchall()
+    conn.close()
+    if meta is None:
+        return None
+    keys = [(-o, r) for o, r, _ in rows]
+    rows = [_json.loads(j) for _, _, j in rows]
+    return {
+        "digest": meta[0],
+        "header": _json.loads(meta[1]),
+        "keys": keys,
+        "rows": rows,
+        "seen": {(_cell(row, 1), -key[0]) for key, row in zip(keys, rows)},
+        "low": meta[2],
+    }
+
+
+def _save_archive_index(spreadsheet_id, index, added=None):
+    """added 为 None 时整体重写，否则只追加这些 (key, row)"""
+    try:
+        conn = _archive_conn()
+    except sqlite3.Error:
+        return
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO archive_index VALUES (?, ?, ?, ?)",
+            (spreadsheet_id, index["digest"], _json.dumps(index["header"], ensure_ascii=False), index["low"]),
+        )
+        if added is None:
+            conn.execute("DELETE FROM archive_rows WHERE spreadsheet_id = ?", (spreadsheet_id,))
+            added = zip(index["keys"], index["rows"])
+        conn.executemany(
+            "INSERT OR REPLACE INTO archive_rows VALUES (?, ?, ?, ?)",
+            [(spreadsheet_id, -o, r, _json.dumps(row, ensure_ascii=False)) for (o, r), row in added],
+        )
+    conn.close()
+
+
+def archive_index(spreadsheet_id, df):
+    """Archive 工作表的有序索引。df 的内容哈希与索引一致时直接复用（内存或本地库），
+    否则说明表格在别处被改过，按 df 重建一次"""
+    store = _archive_store()
+    digest = df.attrs.get("digest")
+    with store["lock"]:
+        index = store["books"].get(spreadsheet_id) or _load_archive_index(spreadsheet_id)
+        if index is None or index["digest"] != digest:
+            index = _build_archive_index(digest, _df_values(df))
+            _save_archive_index(spreadsheet_id, index)
+        store["books"][spreadsheet_id] = index
+        return index
+
+
+def merge_archive_index(spreadsheet_id, plan):
+    """归档写入成功后把新行合并进索引：每行一次二分查找，只向本地库追加新行。
+    合并后的内容哈希按写入后的表格推算，与下次拉取的结果一致时不必重建"""
+    store = _archive_store()
+    with store["lock"]:
+        index = store["books"][spreadsheet_id]
+        new = plan["new"]
+        added = []
+        for j, (ordinal, row) in enumerate(new):
+            key = (-ordinal, index["low"] - len(new) + j)
+            pos = bisect.bisect_left(index["keys"], key)
+            index["keys"].insert(pos, key)
+            index["rows"].insert(pos, row)
+            index["seen"].add((row[1], ordinal))
+            added.append((key, row))
+        index["low"] -= len(new)
+        if not index["header"] and new:
+            index["header"] = ARCHIVE_HEADER
+        index["digest"] = _values_digest([index["header"], *index["rows"]])
+        _save_archive_index(spreadsheet_id, index, added)
+
+
+def archive_span(index, start, end):
+    """完成日期在 [start, end] 内的行在 index["rows"] 中的区间 (lo, hi)（按日期倒序）；
+    start 不晚于最早日期时带上日期无法解析的行"""
+    keys = index["keys"]
+    lo = bisect.bisect_left(keys, (-end.toordinal(),))
+    first = archive_bounds(index)[0]
+    hi = len(keys) if first is None or start <= first else bisect.bisect_left(keys, (-start.toordinal() + 1,))
+    return lo, hi
+
+
+def archive_bounds(index):
+    """(最早, 最晚) 完成日期，没有可解析的日期时为 (None, None)"""
+    keys = index["keys"]
+    dated = bisect.bisect_left(keys, (0,))
+    if not dated:
+        return None, None
+    return date.fromordinal(-keys[dated - 1][0]), date.fromordinal(-keys[0][0])
+
+
+# ============================================================
+# 任务清单：归档（增量写入）
+# ============================================================
+def generate_category_name(description: str) -> str:
+    """根据描述生成简短的大类名称（规则与 archive_tasks.js 一致）"""
+    if "mcp" in description or "windsurf" in description:
+        return "AI工具配置"
+    if "gemini" in description:
+        return "AI工具迁移"
+    if "工作站" in description:
+        return "设备采购"
+    if "中药" in description or "口腔" in description or "健康" in description:
+        return "家庭健康"
+    if "AI" in description and "文章" in description:
+        return "AI文章写作"
+    if "文章" in description or "写作" in description:
+        return "文章写作"
+    if "视频" in description:
+        return "视频制作"
+    return "其他任务"
+
+
+def _archive_entry(row, today):
+    """进行中的一行 -> 归档行 [大类, 描述, 完成日期]"""
+    category = row[0] if row else ""
+    description = _cell(row, 2)
+    if not category or "新增任务" in category or "任务" in category:
+        category = generate_category_name(description)
+    return [_CATEGORY_PREFIX_RE.sub("", category), description, today]
+
+
+def plan_archive(active_values, archive_values, index, today):
+    """计算归档的最小改动，不访问网络。
+
+    active_values / archive_values 为两张工作表的原始值（首行表头），
+    index 为 archive_index() 的结果（与 archive_values 对应）。
+    返回 {"delete": 进行中要删除的行号（0 起，含表头行，降序）,
+          "insert": [(归档表插入位置, [行, ...]), ...]（位置降序）,
+          "new": [(日序数, 行), ...]（按写入后在表中的顺序）,
+          "archived": 新增归档条数, "completed": 已完成条数}
+    新行按表格的实际行序定位：插在第一个完成日期不晚于它的已有行之前。归档表按日期倒序时
+    与旧脚本整表重排的结果一致；被手动改乱（或旧脚本按字符串排过序）时不会插到中间去。
+    去重查索引；定位对实际行序的「前缀最早日期」二分，只解析一遍日期
+    """
+    completed = [
+        i for i, row in enumerate(active_values)
+        if i > 0 and any("已完成" in (cell or "") for cell in row)
+    ]
+    # floor[j]：实际行序中前 j+1 行里最早的日序数，单调不增；取负后升序，可以二分
+    floor = [-o for o in itertools.accumulate(
+        (_done_ordinal(_cell(row, 2)) for row in archive_values[1:]), min)]
+    seen = set()
+    blocks = {}
+    for i in completed:
+        entry = _archive_entry(active_values[i], today)
+        ordinal = _done_ordinal(entry[2])
+        if (entry[1], ordinal) in index["seen"] or (entry[1], ordinal) in seen:
+            continue
+        seen.add((entry[1], ordinal))
+        # 第一个日期不晚于它的已有行之前（+1 跳过表头）
+        pos = bisect.bisect_left(floor, -ordinal) + 1
+        blocks.setdefault(pos, []).append((ordinal, entry))
+
+    new = []
+    for pos in sorted(blocks):
+        # 同一位置上可能有不同日期的新行，块内也按日期倒序
+        blocks[pos].sort(key=lambda item: -item[0])
+        new.extend(blocks[pos])
+    inserts = [(pos, [row for _, row in blocks[pos]]) for pos in sorted(blocks, reverse=True)]
+    if not index["header"] and new:
+        # 归档表还是空的：表头和新行一起写在最上面
+        inserts = [(0, [ARCHIVE_HEADER, *(row for _, row in new)])]
+    return {
+        "delete": completed[::-1],
+        "insert": inserts,
+        "new": new,
+        "archived": len(new),
+        "completed": len(completed),
+    }
+
+
+def _row_ranges(rows_desc):
+    """降序行号合并成连续区间 [(start, end), ...]，仍按降序，删除时前面的行号不受影响"""
+    ranges = []
+    for i in rows_desc:
+        if ranges and ranges[-1][0] == i + 1:
+            ranges[-1][0] = i
+        else:
+            ranges.append([i, i + 1])
+    return [tuple(r) for r in ranges]
+
+
+def archive_requests(plan, active_id, archive_id):
+    """把 plan_archive 的结果转成一次 spreadsheets.batchUpdate 的 requests：整行删除 / 插入空行。
+    新行的内容由 archive_value_data 另外写入"""
+    requests = []
+    for start, end in _row_ranges(plan["delete"]):
+        requests.append({"deleteDimension": {"range": {
+            "sheetId": active_id, "dimension": "ROWS", "startIndex": start, "endIndex": end,
+        }}})
+    for pos, rows in plan["insert"]:
+        requests.append({"insertDimension": {
+            "range": {"sheetId": archive_id, "dimension": "ROWS", "startIndex": pos, "endIndex": pos + len(rows)},
+            "inheritFromBefore": pos > 1,  # 不继承表头的格式
+        }})
+    return requests
+
+
+def archive_value_data(plan, archive):
+    """新行内容 -> values.batchUpdate 的 data，配合 valueInputOption=USER_ENTERED：
+    与 archive_tasks.js 一样按用户输入解析，完成日期存成日期、数字和公式也不会变成纯文本。
+    插入按位置降序执行，每块的最终行号要加上位置在它之前的各块行数"""
+    data = []
+    for pos, rows in plan["insert"]:
+        start = pos + sum(len(r) for p, r in plan["insert"] if p < pos)
+        data.append({"range": absolute_range_name(archive, f"A{start + 1}"), "values": rows})
+    return data
+
+
+def _rewrite_bytes(active_values, index, plan):
+    """旧脚本（clear + values.update 整表重写两张表）要上传的字节数，用于对比"""
+    deleted = set(plan["delete"])
+    remaining = [row for i, row in enumerate(active_values) if i not in deleted]
+    archive = [index["header"] or ARCHIVE_HEADER, *(row for _, row in plan["new"]), *index["rows"]]
+    return sum(len(_json.dumps({"values": v}, ensure_ascii=False).encode()) for v in (remaining, archive))
+
+
+def _rows_unchanged(gc, spreadsheet_id, title, planned):
+    """删除前按行号重读要删的行，与规划时读到的逐行比对；planned: {行号: 行}"""
+    spans = _row_ranges(sorted(planned, reverse=True))
+    sh = _open_spreadsheet(gc, spreadsheet_id)
+    resp = sh.values_batch_get([absolute_range_name(title, f"{start + 1}:{end}") for start, end in spans])
+    for (start, end), vr in zip(spans, resp.get("valueRanges", [])):
+        got = vr.get("values", [])
+        for i in range(start, end):
+            if (got[i - start] if i - start < len(got) else []) != planned[i]:
+                return False
+    return True
+
+
+def archive_completed_tasks(gc, spreadsheet_id=TASK_SPREADSHEET_ID, active="Sheet1", archive="Archive"):
+    """把进行中里含「已完成」的任务移到归档表：一次 values.batchGet 读两张表的最新值
+    （不用 modifiedTime 探测过的缓存，探测有延迟，删行号必须以当前表格为准），
+    用归档索引去重、算出最小改动，一次 batchUpdate 完成删行和插行，再用一次 values.batchUpdate
+    （USER_ENTERED）只写新行的单元格，不受表格大小限制。
+    提交前再按行号重读要删的行，有任何一行与规划时不同就放弃，不删错行。
+    返回 {"completed", "archived", "requests", "bytes", "rewrite_bytes", "conflict"}"""
+    values = _fetch_values(gc, spreadsheet_id, (active, archive))
+    active_values, archive_values = values[active], values[archive]
+    index = archive_index(spreadsheet_id, _sheet_entry(_values_digest(archive_values), archive_values)["df"])
+    if not index["header"] and archive_values:
+        # 只有表头的工作表转成的是空 DataFrame，免得再写一遍表头
+        index["header"] = archive_values[0]
+    plan = plan_archive(active_values, archive_values, index, datetime.now().strftime("%Y/%m/%d"))
+    stats = {
+        "completed": plan["completed"],
+        "archived": plan["archived"],
+        "requests": 0,
+        "bytes": 0,
+        "rewrite_bytes": _rewrite_bytes(active_values, index, plan),
+        "conflict": False,
+    }
+    if not plan["delete"] and not plan["insert"]:
+        return stats
+
+    book = _get_book(spreadsheet_id)
+    if plan["delete"] and not _rows_unchanged(
+        gc, spreadsheet_id, active, {i: active_values[i] for i in plan["delete"]}
+    ):
+        stats["conflict"] = True
+    else:
+        sh = _open_spreadsheet(gc, spreadsheet_id)
+        meta = sh.fetch_sheet_metadata(params={"fields": "sheets.properties(sheetId,title)"})
+        sheet_ids = {s["properties"]["title"]: s["properties"]["sheetId"] for s in meta["sheets"]}
+        body = {"requests": archive_requests(plan, sheet_ids[active], sheet_ids[archive])}
+        sh.batch_update(body)
+        values_body = {"valueInputOption": "USER_ENTERED", "data": archive_value_data(plan, archive)}
+        if values_body["data"]:
+            sh.values_batch_update(values_body)
+        stats["requests"] = len(body["requests"]) + len(values_body["data"])
+        stats["bytes"] = sum(len(_json.dumps(b, ensure_ascii=False).encode()) for b in (body, values_body))
+        merge_archive_index(spreadsheet_id, plan)
+
+    # 下一次 load_sheet 立即重新拉取，不等 modifiedTime 探测间隔
+    with book["lock"]:
+        book["modified"] = None
+        book["checked"] = 0.0
+    _refresh_book(gc, spreadsheet_id, (active, archive))
+    return stats
+
+
+# ============================================================
+# 知乎存档：检索与目录
+# ============================================================
+@st.cache_resource
+def _search_state():
+    """进程级：上次按 mtime 增量更新索引的时间和结果"""
+    return {"lock": threading.Lock(), "checked": 0.0, "stats": None}
+
+
+def refresh_search_index():
+    """最多每 REVISION_CHECK_INTERVAL 秒扫描一次存档目录，只重新切分改过的文件"""
+    state = _search_state()
+    with state["lock"]:
+        if time.time() - state["checked"] >= REVISION_CHECK_INTERVAL:
+            state["stats"] = zhihu_archive.update_index()
+            state["checked"] = time.time()
+        return state["stats"]
+
+
+def _search_hit_html(hit):
+    return (
+        f'<div class="fit-card r8">'
+        f'<div class="fit-card-head"><span class="fit-card-title">{_html.escape(hit["title"])}</span></div>'
+        f'<div class="fit-aux">{_html.escape(hit["source"])} · {pathlib.Path(hit["path"]).name}</div>'
+        f'<div class="fit-note">{hit["snippet"]}</div>'
+        f'</div>'
+    )
+
+
+@st.cache_resource
+def _meta_state():
+    """进程级：元数据表的 DataFrame（只读，跨会话共享）和上次刷新时间"""
+    return {"lock": threading.Lock(), "checked": 0.0, "df": None}
+
+
+def load_archive_meta():
+    """回答/文章元数据表：最多每 REVISION_CHECK_INTERVAL 秒按 mtime 增量刷新一次，
+    内容哈希不变时沿用同一个 DataFrame，调用方必须只读"""
+    state = _meta_state()
+    with state["lock"]:
+        if time.time() - state["checked"] >= REVISION_CHECK_INTERVAL:
+            meta = zhihu_archive.collect_metadata()
+            state["checked"] = time.time()
+            if state["df"] is None or state["df"].attrs["digest"] != meta["digest"]:
+                df = pd.DataFrame(meta["columns"])
+                df.attrs["digest"] = meta["digest"]
+                state["df"] = df
+        return state["df"]
+
+
+def _meta_link(row):
+    return f'<a href="{_html.escape(row.url)}" target="_blank">{_html.escape(row.title)}</a>'
+
+
+def _meta_table_html(df):
+    view = pd.DataFrame({
+        "日期": df["date"].tolist(),
+        "标题": [_meta_link(row) for row in df.itertuples()],
+        "赞同": df["votes"].tolist(),
+        "评论": df["comments"].tolist(),
+        "存档": df["archive"].tolist(),
+    })
+    return _render_table_html(view, style_cells=False)
+
+
+def _meta_cards_html(df):
+    return tuple(
+        f'<div class="fit-card r8">'
+        f'<div class="fit-card-head"><span class="fit-card-title">{_meta_link(row)}</span></div>'
+        f'<div class="fit-aux">{row.date} · 👍 {row.votes} · 💬 {row.comments} · {row.archive}</div>'
+        f'</div>'
+        for row in df.itertuples()
+    )
+
+
+# ============================================================
+# 选项卡（惰性）
+# ============================================================
+FITNESS_TABS = ["📅 训练计划", "🔥 热身", "🧘 拉伸", "📚 动作库", "🏥 身体状况", "📝 备注", "🔬 训练笔记"]
+TASK_TABS = ["📌 进行中", "✅ 已完成"]
+ARCHIVE_TABS = ["🔎 检索", "📑 目录"]
+META_SORTS = {"日期": "date", "赞同": "votes", "评论": "comments"}
+META_KINDS = {"全部": None, "回答": "answer", "文章": "article"}
+
+
+def lazy_tabs(labels, key):
+    """st.tabs 每次都会执行全部选项卡的内容；改用分段单选，只返回选中的那一个，由调用方只渲染它"""
+    return st.radio(key, labels, horizontal=True, key=key, label_visibility="collapsed")
+
+
+# ============================================================
+# 分页（窗口化渲染）
+# ============================================================
+def _turn_page(page_key, delta):
+    st.session_state[page_key] = st.session_state.get(page_key, 0) + delta
+
+
+def _resize_page(key, first_row):
+    """改页大小后停在仍包含原来第一行的那一页"""
+    st.session_state[f"{key}_cursor"] = first_row // st.session_state[f"{key}_size"]
+
+
+def paginate(total, key, scope=()):
+    """长表只渲染一页：返回当前页的行区间 (start, end)。
+    页大小和游标存在 session_state；scope（筛选条件）变化时回到第一页，越界时停在最后一页"""
+    page_key, size_key, scope_key = f"{key}_cursor", f"{key}_size", f"{key}_scope"
+    if st.session_state.get(scope_key) != scope:
+        st.session_state[scope_key] = scope
+        st.session_state[page_key] = 0
+    size = st.session_state.get(size_key, PAGE_SIZES[1])
+    pages = max(1, -(-total // size))
+    page = min(max(st.session_state.get(page_key, 0), 0), pages - 1)
+    st.session_state[page_key] = page
+
+    if total > PAGE_SIZES[0]:
+        prev_col, info_col, next_col, size_col = st.columns([1, 3, 1, 2])
+        prev_col.button("◀", key=f"{key}_prev", disabled=page == 0, on_click=_turn_page, args=(page_key, -1))
+        info_col.caption(f"第 {page + 1} / {pages} 页 · 共 {total} 条")
+        next_col.button(
+            "▶", key=f"{key}_next", disabled=page >= pages - 1, on_click=_turn_page, args=(page_key, 1),
+        )
+        size_col.selectbox(
+            "每页条数", PAGE_SIZES, index=1, key=size_key,
+            on_change=_resize_page, args=(key, page * size), label_visibility="collapsed",
+        )
+    start = page * size
+    return start, min(start + size, total)
 
 
 # ============================================================
@@ -556,6 +1444,7 @@ p, li, span, div { color: #2c3e50; }
     border-radius: 8px;
     padding: 3px;
     display: inline-flex !important;
+    flex-wrap: wrap;
 }
 .stRadio label {
     font-size: 14px !important;
@@ -660,11 +1549,13 @@ p, li, span, div { color: #2c3e50; }
 }
 </style>
 """
+GLOBAL_CSS = GLOBAL_CSS.replace("</style>", _component_css() + "</style>")
 
 
 # ============================================================
 # 主应用
 # ============================================================
+_run_started = time.perf_counter()
 st.markdown(GLOBAL_CSS, unsafe_allow_html=True)
 
 # ---------- PWA: 图标和名称 ----------
@@ -698,7 +1589,7 @@ screen_width = streamlit_js_eval(js_expressions="window.innerWidth", key="screen
 is_mobile = screen_width is not None and screen_width < 768
 
 # ---------- 顶部导航 ----------
-page = st.radio("nav", ["💪 健身计划", "📋 任务清单"], horizontal=True, label_visibility="collapsed")
+page = st.radio("nav", ["💪 健身计划", "📋 任务清单", "📚 知乎存档"], horizontal=True, label_visibility="collapsed")
 
 # ---------- JS: 强制移除 Streamlit 水印 ----------
 streamlit_js_eval(js_expressions="""
@@ -734,30 +1625,28 @@ streamlit_js_eval(js_expressions="""
 """, key="remove_watermark")
 
 try:
-    gc = _get_client()
+    try:
+        gc = _get_client()
+    except Exception:
+        gc = None  # 无凭证时仍可从本地快照渲染
 
     if page == "💪 健身计划":
         # ============================================================
         # 健身计划页面
         # ============================================================
-        tab_plan, tab_warmup, tab_stretch, tab_lib, tab_body, tab_notes_tab, tab_tnotes = st.tabs([
-            "📅 训练计划",
-            "🔥 热身",
-            "🧘 拉伸",
-            "📚 动作库",
-            "🏥 身体状况",
-            "📝 备注",
-            "🔬 训练笔记",
-        ])
-
-        # --- 加载周训练数据（多个 tab 共用） ---
-        df_weekly = load_sheet(gc, FITNESS_SPREADSHEET_ID, "周训练计划")
-        header = df_weekly.columns.tolist() if not df_weekly.empty else []
-        day_data = get_day_data(df_weekly) if not df_weekly.empty else {}
-        day_names = list(day_data.keys())
+        # 只加载和渲染选中的选项卡，其余工作表在本次渲染结束后后台预取
+        fitness_tab = lazy_tabs(FITNESS_TABS, key="fitness_tab")
+        render_sync_status(FITNESS_SPREADSHEET_ID)
+
+        # --- 周训练数据（训练计划 / 热身 / 拉伸共用） ---
+        if fitness_tab in ("📅 训练计划", "🔥 热身", "🧘 拉伸"):
+            df_weekly = load_sheet(gc, FITNESS_SPREADSHEET_ID, "周训练计划", copy=False)
+            weekly_digest = df_weekly.attrs.get("digest")
+            plan = build_plan_model(weekly_digest, df_weekly) if not df_weekly.empty else None
+            day_names = plan["days"] if plan else []
 
         # --- Tab: 训练计划（仅训练日，不含热身/拉伸） ---
-        with tab_plan:
+        if fitness_tab == "📅 训练计划":
             if not df_weekly.empty:
                 training_days = [d for d in day_names if "热身" not in d and "练后拉伸" not in d]
 
@@ -769,63 +1658,66 @@ try:
                         key="mobile_day",
                         label_visibility="collapsed",
                     )
-                    if selected_day in day_data:
-                        render_mobile_day(selected_day, day_data[selected_day], header)
+                    if selected_day in plan["day_frames"]:
+                        render_mobile_day(plan, selected_day)
                 else:
-                    df_weekly.iloc[:, 0] = df_weekly.iloc[:, 0].replace("", pd.NA).ffill().fillna("")
                     selected = st.multiselect(
                         "筛选训练日",
                         options=training_days,
                         default=training_days,
                         key="day_filter",
                     )
-                    df_filtered = df_weekly[df_weekly.iloc[:, 0].isin(selected)]
-                    html = render_table_with_rowspan(df_filtered, merge_col=0)
+                    html = cached_render(
+                        weekly_digest, ("plan", tuple(selected)),
+                        lambda: render_table_with_rowspan(plan_rows(plan, selected), merge_col=0),
+                    )
                     st.markdown(html, unsafe_allow_html=True)
             else:
                 st.info("无数据")
 
         # --- Tab: 热身 ---
-        with tab_warmup:
+        if fitness_tab == "🔥 热身":
             warmup_keys = [d for d in day_names if "热身" in d]
             if warmup_keys:
                 if is_mobile:
-                    render_mobile_day(warmup_keys[0], day_data[warmup_keys[0]], header, use_phase_tabs=False)
+                    render_mobile_day(plan, warmup_keys[0], use_phase_tabs=False)
                 else:
-                    df_w = df_weekly.copy()
-                    df_w.iloc[:, 0] = df_w.iloc[:, 0].replace("", pd.NA).ffill().fillna("")
-                    df_warmup = df_w[df_w.iloc[:, 0].isin(warmup_keys)]
-                    html = render_table_with_rowspan(df_warmup, merge_col=0)
+                    html = cached_render(
+                        weekly_digest, ("warmup",), lambda: render_table_with_rowspan(plan_rows(plan, warmup_keys), merge_col=0),
+                    )
                     st.markdown(html, unsafe_allow_html=True)
             else:
                 st.info("无热身数据")
 
         # --- Tab: 拉伸 ---
-        with tab_stretch:
+        if fitness_tab == "🧘 拉伸":
             stretch_keys = [d for d in day_names if "练后拉伸" in d]
             if stretch_keys:
                 if is_mobile:
-                    render_mobile_day(stretch_keys[0], day_data[stretch_keys[0]], header, use_phase_tabs=False)
+                    render_mobile_day(plan, stretch_keys[0], use_phase_tabs=False)
                 else:
-                    df_s = df_weekly.copy()
-                    df_s.iloc[:, 0] = df_s.iloc[:, 0].replace("", pd.NA).ffill().fillna("")
-                    df_stretch = df_s[df_s.iloc[:, 0].isin(stretch_keys)]
-                    html = render_table_with_rowspan(df_stretch, merge_col=0)
+                    html = cached_render(
+                        weekly_digest, ("stretch",), lambda: render_table_with_rowspan(plan_rows(plan, stretch_keys), merge_col=0),
+                    )
                     st.markdown(html, unsafe_allow_html=True)
             else:
                 st.info("无拉伸数据")
 
         # --- Tab: 动作库 ---
-        with tab_lib:
-            df_lib = load_sheet(gc, FITNESS_SPREADSHEET_ID, "动作库")
+        if fitness_tab == "📚 动作库":
+            # 只读共享的 DataFrame：筛选得到新对象，再只渲染当前页
+            df_lib = load_sheet(gc, FITNESS_SPREADSHEET_ID, "动作库", copy=False)
+            lib_digest = df_lib.attrs.get("digest")
             if not df_lib.empty:
                 if is_mobile:
+                    selected_type = "全部"
                     if "动作类型" in df_lib.columns:
                         types = df_lib["动作类型"].unique().tolist()
                         selected_type = st.selectbox("筛选类型", ["全部"] + types, key="mobile_type")
                         if selected_type != "全部":
                             df_lib = df_lib[df_lib["动作类型"] == selected_type]
-                    render_mobile_lib(df_lib)
+                    page_start, page_end = paginate(len(df_lib), "lib_page", scope=(selected_type,))
+                    render_mobile_lib(df_lib.iloc[page_start:page_end])
                 else:
                     if "动作类型" in df_lib.columns:
                         types = df_lib["动作类型"].unique().tolist()
@@ -833,27 +1725,36 @@ try:
                             "按动作类型筛选", options=types, default=types, key="type_filter",
                         )
                         df_lib = df_lib[df_lib["动作类型"].isin(selected_types)]
-                    html = render_simple_table(df_lib)
+                    else:
+                        selected_types = []
+                    page_start, page_end = paginate(len(df_lib), "lib_page", scope=tuple(selected_types))
+                    df_page = df_lib.iloc[page_start:page_end]
+                    html = cached_render(
+                        lib_digest, ("lib", tuple(selected_types), page_start, page_end),
+                        lambda: render_simple_table(df_page),
+                    )
                     st.markdown(html, unsafe_allow_html=True)
                     st.caption(f"共 {len(df_lib)} 个动作")
             else:
                 st.info("无数据")
 
         # --- Tab: 身体状况与禁忌 ---
-        with tab_body:
+        if fitness_tab == "🏥 身体状况":
             df_body = load_sheet(gc, FITNESS_SPREADSHEET_ID, "身体状况与禁忌")
             if not df_body.empty:
                 if is_mobile:
                     render_mobile_body(df_body)
                 else:
                     df_body.iloc[:, 0] = df_body.iloc[:, 0].replace("", pd.NA).ffill().fillna("")
-                    html = render_table_with_rowspan(df_body, merge_col=0)
+                    html = cached_render(
+                        df_body.attrs.get("digest"), ("body",), lambda: render_table_with_rowspan(df_body, merge_col=0),
+                    )
                     st.markdown(html, unsafe_allow_html=True)
             else:
                 st.info("无数据")
 
         # --- Tab: 备注与说明 ---
-        with tab_notes_tab:
+        if fitness_tab == "📝 备注":
             df_notes = load_sheet(gc, FITNESS_SPREADSHEET_ID, "备注与说明")
             if not df_notes.empty:
                 for _, row in df_notes.iterrows():
@@ -866,7 +1767,7 @@ try:
                     else:
                         if is_mobile:
                             st.markdown(
-                                f'<div style="margin-bottom:6px;"><span style="font-weight:600;font-size:14px;color:#333;">{topic}</span><br><span style="font-size:13px;color:#666;">{content}</span></div>',
+                                f'<div class="fit-topic"><span class="fit-topic-title">{topic}</span><br><span class="fit-topic-body">{content}</span></div>',
                                 unsafe_allow_html=True,
                             )
                         else:
@@ -875,8 +1776,9 @@ try:
                 st.info("无数据")
 
         # --- Tab: 训练笔记 ---
-        with tab_tnotes:
+        if fitness_tab == "🔬 训练笔记":
             df_tnotes = load_sheet(gc, FITNESS_SPREADSHEET_ID, "训练笔记")
+            tnotes_digest = df_tnotes.attrs.get("digest")
             if not df_tnotes.empty:
                 if is_mobile:
                     priorities = df_tnotes["优先级"].unique().tolist() if "优先级" in df_tnotes.columns else []
@@ -895,32 +1797,143 @@ try:
                     df_tnotes = df_tnotes[
                         df_tnotes["优先级"].isin(sel_pri) & df_tnotes["状态"].isin(sel_sta)
                     ]
-                    html = render_simple_table(df_tnotes)
+                    html = cached_render(
+                        tnotes_digest, ("tnotes", tuple(sel_pri), tuple(sel_sta)),
+                        lambda: render_simple_table(df_tnotes),
+                    )
                     st.markdown(html, unsafe_allow_html=True)
                     st.caption(f"共 {len(df_tnotes)} 条训练笔记")
             else:
                 st.info("无训练笔记")
 
+        prefetch_sheets(gc, FITNESS_SPREADSHEET_ID, SPREADSHEET_SHEETS[FITNESS_SPREADSHEET_ID])
+
     elif page == "📋 任务清单":
         # ============================================================
         # 任务清单页面
         # ============================================================
-        tab_active, tab_archive = st.tabs(["📌 进行中", "✅ 已完成"])
-
-        with tab_active:
+        task_tab = lazy_tabs(TASK_TABS, key="task_tab")
+        render_sync_status(TASK_SPREADSHEET_ID)
+
+        if task_tab == "📌 进行中":
+            if gc is not None and st.button("🗂 归档已完成", key="archive_tasks"):
+                with st.spinner("正在归档..."):
+                    result = archive_completed_tasks(gc)
+                if result["conflict"]:
+                    st.warning("进行中的任务刚被改动过，已取消本次归档，请确认后重试")
+                elif result["requests"]:
+                    st.success(f"已完成 {result['completed']} 条，新增归档 {result['archived']} 条")
+                    st.caption(
+                        f"{result['requests']} 个改动请求 · 上传 {result['bytes'] / 1024:.1f} KB"
+                        f"（整表重写需 {result['rewrite_bytes'] / 1024:.1f} KB）"
+                    )
+                else:
+                    st.info("没有需要归档的任务")
             df_active = load_sheet(gc, TASK_SPREADSHEET_ID, "Sheet1")
             if not df_active.empty:
                 render_task_table(df_active, "进行中", is_mobile)
             else:
                 st.info("无数据")
 
-        with tab_archive:
-            df_archive = load_sheet(gc, TASK_SPREADSHEET_ID, "Archive")
+        if task_tab == "✅ 已完成":
+            df_archive = load_sheet(gc, TASK_SPREADSHEET_ID, "Archive", copy=False)
             if not df_archive.empty:
-                render_task_table(df_archive, "已完成", is_mobile)
+                # 按完成日期区间翻阅：从有序索引里二分取出区间内的行，只渲染这一段
+                archive = archive_index(TASK_SPREADSHEET_ID, df_archive)
+                first, last = archive_bounds(archive)
+                if first is not None:
+                    picked = st.date_input(
+                        "完成日期",
+                        value=(max(first, last - timedelta(days=ARCHIVE_DEFAULT_DAYS)), last),
+                        min_value=first,
+                        max_value=last,
+                        key="archive_range",
+                    )
+                    start, end = picked if len(picked) == 2 else (picked[0], picked[0])
+                else:
+                    start, end = date.min, date.max
+                lo, hi = archive_span(archive, start, end)
+                page_start, page_end = paginate(hi - lo, "archive_page", scope=(start, end))
+                width = len(df_archive.columns)
+                df_page = pd.DataFrame(
+                    [row[:width] + [""] * (width - len(row)) for row in archive["rows"][lo + page_start:lo + page_end]],
+                    columns=df_archive.columns,
+                )
+                df_page.attrs["digest"] = archive["digest"]
+                render_task_table(df_page, "已完成", is_mobile, key=(start, end, page_start, page_end))
+                st.caption(f"{start} ~ {end} · {hi - lo} / {len(archive['rows'])} 条")
             else:
                 st.info("无数据")
 
+        prefetch_sheets(gc, TASK_SPREADSHEET_ID, SPREADSHEET_SHEETS[TASK_SPREADSHEET_ID])
+
+    elif page == "📚 知乎存档":
+        # ============================================================
+        # 知乎回答 / 文章 / 草稿：全文检索和按日期、赞同、评论排序的目录
+        # ============================================================
+        archive_tab = lazy_tabs(ARCHIVE_TABS, key="archive_tab")
+
+        if archive_tab == "🔎 检索":
+            index_stats = refresh_search_index()
+            query = st.text_input(
+                "检索", key="archive_query", placeholder="关键词，多个词用空格分隔", label_visibility="collapsed",
+            )
+            if query.strip():
+                search_started = time.perf_counter()
+                hits = zhihu_archive.search(query, limit=SEARCH_LIMIT)
+                search_ms = (time.perf_counter() - search_started) * 1000
+                if hits:
+                    for hit in hits:
+                        st.markdown(_search_hit_html(hit), unsafe_allow_html=True)
+                else:
+                    st.info("没有找到相关内容")
+                st.caption(f"命中 {len(hits)} 条 · {search_ms:.0f} ms · 索引 {index_stats['total']} 个文件")
+            else:
+                st.caption(f"已索引 {index_stats['total']} 个文件（知乎回答、文章和 articles 草稿）")
+
+        if archive_tab == "📑 目录":
+            df_meta = load_archive_meta()
+            if not df_meta.empty:
+                col_a, col_b, col_c = st.columns(3)
+                with col_a:
+                    sel_archive = st.selectbox(
+                        "存档", ["全部", *df_meta["archive"].unique().tolist()], key="meta_archive",
+                    )
+                with col_b:
+                    sel_kind = st.selectbox("类型", list(META_KINDS), key="meta_kind")
+                with col_c:
+                    sel_sort = st.selectbox("排序", list(META_SORTS), key="meta_sort")
+                mask = pd.Series(True, index=df_meta.index)
+                if sel_archive != "全部":
+                    mask &= df_meta["archive"] == sel_archive
+                if META_KINDS[sel_kind]:
+                    mask &= df_meta["kind"] == META_KINDS[sel_kind]
+                # 同值时按日期倒序，稳定排序保证翻页顺序不变
+                df_view = df_meta[mask].sort_values(
+                    [META_SORTS[sel_sort], "date"], ascending=False, kind="stable",
+                )
+                scope = (sel_archive, sel_kind, sel_sort)
+                page_start, page_end = paginate(len(df_view), "meta_page", scope=scope)
+                df_page = df_view.iloc[page_start:page_end]
+                meta_key = ("meta", *scope, page_start, page_end, is_mobile)
+                if is_mobile:
+                    for block in cached_render(df_meta.attrs["digest"], meta_key, lambda: _meta_cards_html(df_page)):
+                        st.markdown(block, unsafe_allow_html=True)
+                else:
+                    html = cached_render(df_meta.attrs["digest"], meta_key, lambda: _meta_table_html(df_page))
+                    st.markdown(html, unsafe_allow_html=True)
+                st.caption(f"共 {len(df_view)} 篇")
+            else:
+                st.info("无数据")
+
+    if st.query_params.get("debug"):
+        stats = render_cache_stats()
+        st.caption(f"本次运行耗时：{(time.perf_counter() - _run_started) * 1000:.0f} ms")
+        st.caption(
+            f"渲染缓存：命中 {stats['hits']} / 未命中 {stats['misses']}（{stats['hit_rate']:.0%}）· "
+            f"{stats['entries']} 条 · {stats['size'] / 1024:.0f} KB"
+        )
+
 except Exception as e:
     st.error(f"连接失败：{e}")
     st.info("请检查 Streamlit Secrets 中的 Google Sheet 凭证配置。")
@@ -0,0 +1,27 @@
+"""
+知乎抓取库：浏览器/HTTP 会话、页面提取器、并行抓取、断点续抓与缓存、结果输出、指标时序库
+
+各脚本（zhihu_search_tool.py、search_zhihu.py、debug_page.py、read_article.py、
+zhihu_metrics.py）都是这个包上的薄入口。
+"""
+from .browser import (
+    browser_session, document_ready, inject_cookies, is_logged_in, open_browser,
+    setup_driver, wait_for, wait_for_login,
+)
+from .crawl import fetch_details, get_question_detail, harvest_and_fetch, search_keyword
+from .extract import (
+    EXTRACTORS, extract, extract_answer, extract_article, extract_page_metrics,
+    parse_initial_data, parse_number,
+)
+from .http_client import get_question_detail_http, make_session, search_keyword_api
+from .pacing import throttle
+
+__all__ = [
+    "browser_session", "document_ready", "inject_cookies", "is_logged_in", "open_browser",
+    "setup_driver", "wait_for", "wait_for_login",
+    "fetch_details", "get_question_detail", "harvest_and_fetch", "search_keyword",
+    "EXTRACTORS", "extract", "extract_answer", "extract_article", "extract_page_metrics",
+    "parse_initial_data", "parse_number",
+    "get_question_detail_http", "make_session", "search_keyword_api",
+    "throttle",
+]
@@ -0,0 +1,196 @@
+"""
+浏览器会话：Chrome 启动、登录态、按元素就绪等待
+
+主浏览器使用 .cache/chrome-profile 用户目录，登录态跨运行保留；
+Cookie 通过 CDP 直接写入浏览器，不需要先打开首页再刷新。
+"""
+import contextlib
+import os
+import re
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from webdriver_manager.chrome import ChromeDriverManager
+
+from .config import (
+    CHROME_PROFILE_DIR, COOKIE_STR, LOCAL_CHROMEDRIVER, PAGE_LOAD_TIMEOUT, PAGE_LOAD_WAIT,
+)
+
+
+def setup_driver(headless=False, profile_dir=None):
+    """启动 Chrome；主窗口有界面（方便手动登录），并行 worker 用 headless
+
+    profile_dir 为 Chrome 用户目录，同一目录同时只能给一个浏览器用，并行 worker 不传。
+    """
+    opts = Options()
+    if headless:
+        opts.add_argument("--headless=new")
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        opts.add_argument(f"--user-data-dir={profile_dir}")
+    opts.add_argument("--disable-blink-features=AutomationControlled")
+    opts.add_experimental_option("excludeSwitches", ["enable-automation"])
+    opts.add_experimental_option("useAutomationExtension", False)
+    opts.add_argument("--window-size=1280,900")
+    
+    # 优先使用本地缓存的 chromedriver，避免网络请求
+    if os.path.exists(LOCAL_CHROMEDRIVER):
+        service = Service(LOCAL_CHROMEDRIVER)
+    else:
+        service = Service(ChromeDriverManager().install())
+    
+    driver = webdriver.Chrome(service=service, options=opts)
+    # 隐藏 webdriver 标记
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+        "source": """
+            Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+            window.chrome = {runtime: {}};
+        """
+    })
+    return driver
+
+
+# ============================================================
+# 等待：按页面元素就绪与否判断，而不是固定 sleep
+# ============================================================
+_ready_durations = []  # 最近几次页面就绪耗时（秒），用于自适应超时
+
+
+def adaptive_timeout():
+    """等待上限 = 最近 10 次就绪耗时平均值的 3 倍，限制在 [PAGE_LOAD_WAIT, PAGE_LOAD_TIMEOUT]"""
+    recent = _ready_durations[-10:]
+    if not recent:
+        return PAGE_LOAD_TIMEOUT
+    return min(PAGE_LOAD_TIMEOUT, max(PAGE_LOAD_WAIT, 3 * sum(recent) / len(recent)))
+
+
+def wait_for(driver, condition, timeout=None):
+    """等待 condition(driver) 返回真值；超时返回 None 而不是抛异常"""
+    timeout = adaptive_timeout() if timeout is None else timeout
+    start = time.monotonic()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=0.2).until(condition)
+    except TimeoutException:
+        return None
+    _ready_durations.append(time.monotonic() - start)
+    return result
+
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def question_link_count(driver):
+    return len(driver.find_elements(By.CSS_SELECTOR, "a[href*='/question/']"))
+
+
+# ============================================================
+# 登录态
+# ============================================================
+def _cookie_pairs():
+    """COOKIE_STR -> [(name, value), ...]"""
+    pairs = []
+    for cookie_pair in COOKIE_STR.split("; "):
+        if "=" in cookie_pair:
+            name, value = cookie_pair.split("=", 1)
+            pairs.append((name.strip(), value.strip()))
+    return pairs
+
+
+def _issued_at(z_c0):
+    """z_c0 形如 2|1:0|10:<签发时间戳>|4:z_c0|...，取出签发时间；解析不了返回 0"""
+    m = re.search(r"\|10:(\d+)\|", z_c0.strip('"'))
+    return int(m.group(1)) if m else 0
+
+
+def session_cookie(driver):
+    """浏览器里的知乎登录 Cookie（z_c0）字典，没有时返回 None，不需要打开页面"""
+    cookies = driver.execute_cdp_cmd("Network.getCookies", {"urls": ["https://www.zhihu.com"]})
+    return next((c for c in cookies.get("cookies", []) if c["name"] == "z_c0"), None)
+
+
+def inject_cookies(driver):
+    """通过 CDP 写入 COOKIE_STR，对之后所有页面生效，不需要先打开首页再刷新"""
+    cookies = [{"name": name, "value": value, "domain": ".zhihu.com", "path": "/"}
+               for name, value in _cookie_pairs()]
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+
+
+def wait_for_login(driver, auto_mode=False):
+    """自动模式：用户目录里没有可用的登录态时注入 Cookie；手动模式：打开首页等待用户登录
+
+    自动模式不打开页面，只比较 Cookie：用户目录里的 z_c0 已过期，或比 COOKIE_STR
+    里的签发得早，都改用 COOKIE_STR，避免一个过期的旧登录态把新配置的 Cookie 挡住。
+    """
+    if auto_mode:
+        saved = session_cookie(driver)
+        configured = dict(_cookie_pairs()).get("z_c0")
+        if saved is None:
+            print("[AUTO] 注入 Cookie 登录...")
+            inject_cookies(driver)
+        elif 0 < saved.get("expires", -1) < time.time():
+            print("[WARN] 已保存的登录态已过期，改用 COOKIE_STR 登录...")
+            inject_cookies(driver)
+        elif configured and _issued_at(configured) > _issued_at(saved["value"]):
+            print("[AUTO] COOKIE_STR 比已保存的登录态新，注入 Cookie 登录...")
+            inject_cookies(driver)
+        else:
+            print("[AUTO] 沿用已保存的登录态")
+        return
+    
+    driver.get("https://www.zhihu.com")
+    wait_for(driver, document_ready)
+    
+    # 检查是否已登录
+    if is_logged_in(driver):
+        print("[OK] 已检测到登录状态")
+        return
+    
+    print("\n" + "=" * 50)
+    print("请在弹出的 Chrome 窗口中登录知乎")
+    print("登录完成后，回到这里按回车继续...")
+    print("=" * 50)
+    input()
+    
+    # 验证登录
+    driver.get("https://www.zhihu.com")
+    wait_for(driver, document_ready)
+    if is_logged_in(driver):
+        print("[OK] 登录成功！")
+    else:
+        print("[WARN] 未检测到登录状态，继续尝试...")
+
+
+def is_logged_in(driver):
+    """检查是否已登录"""
+    try:
+        # 已登录用户页面会有头像元素
+        driver.find_element(By.CSS_SELECTOR, ".AppHeader-profileEntry, .AppHeader-userInfo, img.Avatar")
+        return True
+    except:
+        return False
+
+
+# ============================================================
+# 会话管理
+# ============================================================
+def open_browser(headless=False, auto_mode=True, profile=True):
+    """启动并登录一个浏览器；profile=True 时使用持久的用户目录"""
+    driver = setup_driver(headless=headless, profile_dir=CHROME_PROFILE_DIR if profile else None)
+    wait_for_login(driver, auto_mode=auto_mode)
+    return driver
+
+
+@contextlib.contextmanager
+def browser_session(headless=False, auto_mode=True, profile=True):
+    """with browser_session() as driver: ... 退出时关闭浏览器"""
+    driver = open_browser(headless=headless, auto_mode=auto_mode, profile=profile)
+    try:
+        yield driver
+    finally:
+        driver.quit()
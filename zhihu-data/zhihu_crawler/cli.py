@@ -0,0 +1,170 @@
+"""
+zhihu_search_tool.py 的命令行入口，用法见该脚本的说明
+"""
+import sys
+
+from .browser import setup_driver, wait_for_login
+from .config import CACHE_MAX_AGE_HOURS, CHROME_PROFILE_DIR
+from .crawl import fetch_details, harvest_and_fetch, search_keyword
+from .http_client import make_session
+from .metrics import ingest_snapshots, record_observations
+from .output import close_sink, open_sink, print_summary, sink_write
+from .state import (
+    cache_lookup, cache_put, cache_report, close_journal, journal_append, open_cache, open_journal,
+)
+
+
+def main():
+    args = sys.argv[1:]
+    
+    # 解析参数
+    keywords = []
+    direct_qids = []
+    mode = "search"  # search 或 questions
+    auto_mode = False
+    workers = 1
+    http_mode = False
+    fresh = False
+    max_age = CACHE_MAX_AGE_HOURS
+    parquet = False
+    
+    i = 0
+    while i < len(args):
+        if args[i] == "--file":
+            i += 1
+            if i < len(args):
+                with open(args[i], "r", encoding="utf-8") as f:
+                    keywords = [line.strip() for line in f if line.strip()]
+            i += 1
+        elif args[i] == "--questions":
+            mode = "questions"
+            i += 1
+            while i < len(args) and not args[i].startswith("--"):
+                direct_qids.append(args[i])
+                i += 1
+        elif args[i] == "--auto":
+            auto_mode = True
+            i += 1
+        elif args[i] == "--max-age":
+            i += 1
+            if i < len(args):
+                max_age = float(args[i])
+            i += 1
+        elif args[i] == "--parquet":
+            parquet = True
+            i += 1
+        elif args[i] == "--fresh":
+            fresh = True
+            i += 1
+        elif args[i] == "--http":
+            http_mode = True
+            i += 1
+        elif args[i] == "--workers":
+            i += 1
+            if i < len(args):
+                workers = max(1, int(args[i]))
+            i += 1
+        else:
+            keywords.append(args[i])
+            i += 1
+    
+    if not keywords and not direct_qids:
+        # 默认关键词
+        keywords = ["MCP协议", "Cursor 使用", "AI编程工具", "Windsurf Cursor"]
+        print(f"[INFO] 未指定关键词，使用默认: {keywords}")
+    
+    if mode == "questions":
+        journal = open_journal({"mode": mode, "qids": direct_qids}, fresh=fresh)
+    else:
+        journal = open_journal({"mode": mode, "keywords": keywords}, fresh=fresh)
+    fetched = journal["fetched"]
+    cache = open_cache()
+    sink = open_sink(parquet=parquet)
+    saved = False
+    
+    def record(data, elapsed):
+        """新抓到的问题：记日志、进缓存、进时序库、写输出"""
+        journal_append(journal, {"type": "question", "data": data})
+        cache_put(cache, data, elapsed)
+        record_observations([data])
+        sink_write(sink, data)
+    
+    def known(data, kw):
+        """日志或缓存里已有的问题只写输出（不是新观测）"""
+        sink_write(sink, {**data, "keyword": kw})
+    
+    session = make_session(pool_size=workers) if http_mode else None
+    
+    # 启动浏览器；HTTP 模式直接查询问题时不需要浏览器（失败的问题再按需开 headless）
+    driver = None
+    if not (http_mode and mode == "questions"):
+        print("[启动] 正在打开 Chrome...")
+        driver = setup_driver(profile_dir=CHROME_PROFILE_DIR)
+    
+    try:
+        # 等待登录
+        if driver is not None:
+            wait_for_login(driver, auto_mode=auto_mode)
+        
+        if mode == "questions":
+            # 直接查询问题ID
+            print(f"\n[模式] 直接查询 {len(direct_qids)} 个问题")
+            jobs = [(qid, "直接查询") for qid in direct_qids]
+        elif session is not None:
+            # HTTP 搜索模式：边搜边抓
+            print(f"\n[搜索] {len(keywords)} 个关键词并发，{workers} 个 worker")
+            total = harvest_and_fetch(
+                driver, session, keywords, journal, cache, max_age, workers, record, known)
+            print(f"\n[详情] 共 {total} 个问题")
+        else:
+            # 浏览器搜索模式：先搜完所有关键词，得到按出现顺序去重的问题列表
+            jobs = []
+            seen = set()
+            for kw in keywords:
+                qids = journal["searched"].get(kw)
+                if qids is None:
+                    qids = search_keyword(driver, kw)
+                    journal_append(journal, {"type": "search", "keyword": kw, "qids": qids})
+                for qid in qids:
+                    if qid not in seen:
+                        seen.add(qid)
+                        jobs.append((qid, kw))
+            print(f"\n[详情] {len(jobs)} 个问题，{workers} 个 worker")
+        
+        if mode == "questions" or session is None:
+            # 日志里已有的、缓存未过期的问题不再抓取，直接写输出
+            pending = [(qid, kw) for qid, kw in jobs if qid not in fetched]
+            cached = cache_lookup(cache, [qid for qid, _ in pending], max_age)
+            for qid, kw in jobs:
+                if qid in fetched or qid in cached:
+                    known(fetched.get(qid) or cached[qid], kw)
+            todo = [(qid, kw) for qid, kw in pending if qid not in cached]
+            fetch_details(driver, todo, workers=workers, session=session, on_result=record)
+        
+        # 输出结果
+        path = close_sink(sink)
+        if path:
+            print_summary(sink)
+            ingest_snapshots([path])
+            saved = True
+        else:
+            print("\n[WARN] 未抓取到任何问题数据")
+        cache_report(cache)
+    
+    finally:
+        if not sink["file"].closed:
+            close_sink(sink)  # 中断时保留已写出的部分结果
+        close_journal(journal, done=saved)
+        cache["conn"].close()
+        if session is not None:
+            session.close()
+        if driver is not None:
+            if not auto_mode:
+                print("\n[关闭] 按回车关闭浏览器...")
+                try:
+                    input()
+                except EOFError:
+                    pass
+            driver.quit()
+        print("[完成]")
+
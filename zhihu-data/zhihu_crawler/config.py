@@ -0,0 +1,27 @@
+"""
+配置：Cookie、节奏、路径等常量，所有模块共用
+"""
+import os
+
+COOKIE_STR = '_zap=f70d2cc8-1c1e-4381-8d47-0c9ace806b8a; d_c0=njCUCZdQxxuPTpg4YTKf4D93JPO2vcD67s0=|1770012258; captcha_session_v2=2|1:0|10:1770012258|18:captcha_session_v2|88:MWpYNExKZGgvdkl3VXR5TjFWd2tFNjduL3RSMkRqL0FPa0Z2RGxKQW5iNjd6aEZWR1BmRWxzeDdlTGlOa0l3Rw==|478dc190638d08b0fb17e674ca763ddefe6d2ab60289dc325f2daf47cdb37eab; __snaker__id=6I0ajfiGe69P8tjk; q_c1=f97081cf1a5845cca9aaee5f3c895b60|1770012278000|1770012278000; z_c0=2|1:0|10:1770012934|4:z_c0|92:Mi4xOHZzdkFBQUFBQUNlTUpRSmwxREhHeGNBQUFCZ0FsVk5kWXh0YWdDV2ZReXNpeFY5Zmg3aUU2TW41VEZEY0pQNTFn|70b29f833c24722f7867c04e74c5db665df64a59faf6a3afce1f7f536501d2cb; _xsrf=efc43ffb-b060-49a5-a059-3a5dbcf7f1c5; HMACCOUNT=618EDB8F15DA672D; BEC=e9bdbc10d489caddf435785a710b7029; SESSIONID=V4mhgSdk87QLenHzoIk3Qs2LAVs9R0isnSMYx6y6MbR; JOID=VVscBUPjGsLNJxH-T0xQ2AS-QDJasSSgq09GkCvUKZmOTHCyP1OSSaUsH_tO3aRhGuH2LoYPhf5nS4kqZ9i_84w=; osd=UlwUAE3kHcrIKRb5R0le3wO2RTxdtiylpUhBmC7aLp6GSX61OFuXR6IrF_5A2qNpH-_xKY4Ki_lgQ4wkYN-39oI='
+MAX_QUESTIONS_PER_KEYWORD = 20   # 每个关键词最多抓取多少个问题
+SCROLL_PAUSE = 2                  # 搜索页滚动后等待新结果的上限（秒）
+PAGE_LOAD_WAIT = 3                # 页面就绪等待的下限（秒），实际上限按最近耗时自适应
+PAGE_LOAD_TIMEOUT = 15            # 页面就绪等待的绝对上限（秒）
+BETWEEN_REQUESTS_WAIT = 1.5       # 两次请求的最小间隔（秒，所有并行 worker 共享），页面加载已耗掉的时间不再重复等
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # zhihu-data/
+OUTPUT_DIR = DATA_DIR
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
+STATE_DIR = os.path.join(CACHE_DIR, "crawl_state")  # 断点续抓日志
+QUESTION_CACHE_DB = os.path.join(CACHE_DIR, "questions.sqlite3")  # 跨运行的问题缓存
+CHROME_PROFILE_DIR = os.path.join(CACHE_DIR, "chrome-profile")  # 主浏览器的用户目录，登录态跨运行保留
+LOCAL_CHROMEDRIVER = r"C:\Users\sweet\.wdm\drivers\chromedriver\win64\144.0.7559.133\chromedriver-win32\chromedriver.exe"
+CACHE_MAX_AGE_HOURS = 24          # 缓存有效期（小时）
+HOT_FOLLOWERS = 1000              # 关注数达到此值的热门问题，有效期缩短为 1/4
+HTTP_TIMEOUT = 10                 # HTTP 模式单次请求超时（秒）
+SEARCH_API = "https://www.zhihu.com/api/v4/search_v3"
+SEARCH_PAGE_SIZE = 20             # 搜索接口每页条数
+SUMMARY_TOP_K = 50                # 汇总里每个排名最多列出多少个问题
+PARQUET_BATCH = 500               # Parquet 每攒够多少行写一个 row group
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36")
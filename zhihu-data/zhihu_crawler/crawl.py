@@ -0,0 +1,351 @@
+"""
+抓取流程：浏览器搜索/问题详情、并行 worker 池、HTTP 模式的边搜边抓
+"""
+import queue
+import re
+import threading
+import time
+
+import requests
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from .browser import inject_cookies, question_link_count, setup_driver, wait_for
+from .config import MAX_QUESTIONS_PER_KEYWORD, SCROLL_PAUSE
+from .extract import extract_page_metrics, parse_number
+from .http_client import get_question_detail_http, search_keyword_api
+from .pacing import throttle
+from .state import cache_lookup, journal_append
+
+
+def search_keyword(driver, keyword, max_questions=MAX_QUESTIONS_PER_KEYWORD):
+    """搜索关键词，提取问题ID列表"""
+    print(f"\n[搜索] {keyword}")
+    url = f"https://www.zhihu.com/search?type=content&q={keyword}"
+    throttle()
+    driver.get(url)
+    # 第一批结果出现即可开始提取
+    wait_for(driver, lambda d: question_link_count(d) > 0)
+    
+    question_ids = set()
+    last_count = 0
+    scroll_attempts = 0
+    max_scroll = 8  # 最多滚动8次
+    
+    while len(question_ids) < max_questions and scroll_attempts < max_scroll:
+        # 从当前页面提取问题链接
+        links = driver.find_elements(By.CSS_SELECTOR, "a[href*='/question/']")
+        for link in links:
+            href = link.get_attribute("href") or ""
+            m = re.search(r'/question/(\d+)', href)
+            if m:
+                question_ids.add(m.group(1))
+        
+        if len(question_ids) >= max_questions:
+            break
+        
+        # 如果没有新问题出现，再滚动
+        if len(question_ids) == last_count:
+            scroll_attempts += 1
+        else:
+            scroll_attempts = 0
+        last_count = len(question_ids)
+        
+        # 滚动加载更多：链接数增加就继续，最多等 SCROLL_PAUSE 秒
+        before = question_link_count(driver)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        wait_for(driver, lambda d: question_link_count(d) > before, timeout=SCROLL_PAUSE)
+    
+    qids = list(question_ids)[:max_questions]
+    print(f"  找到 {len(qids)} 个问题")
+    return qids
+
+
+def get_question_detail(driver, qid):
+    """访问问题页面，提取关注数/回答数/浏览量"""
+    url = f"https://www.zhihu.com/question/{qid}"
+    throttle()
+    driver.get(url)
+    # 关注/浏览数（NumberBoard）或标题出现即视为就绪
+    wait_for(driver, EC.any_of(
+        EC.presence_of_element_located((By.CSS_SELECTOR, ".NumberBoard-itemValue")),
+        EC.presence_of_element_located((By.CSS_SELECTOR, "h1.QuestionHeader-title")),
+    ))
+    
+    data = extract_page_metrics(driver.page_source, qid)
+    
+    # 源码里缺的字段才回到 DOM 查找
+    if not data["title"]:
+        for h in driver.find_elements(By.CSS_SELECTOR, "h1.QuestionHeader-title"):
+            t = h.text.strip()
+            if t:
+                data["title"] = t
+                break
+    if data["follower_count"] == 0 or data["visit_count"] == 0:
+        try:
+            numbers = driver.find_elements(By.CSS_SELECTOR, ".NumberBoard-itemValue")
+            labels = driver.find_elements(By.CSS_SELECTOR, ".NumberBoard-itemName")
+            for num_el, label_el in zip(numbers, labels):
+                label = label_el.text.strip()
+                val = parse_number(num_el.get_attribute("title") or num_el.text)
+                if "关注" in label and data["follower_count"] == 0:
+                    data["follower_count"] = val
+                elif "浏览" in label and data["visit_count"] == 0:
+                    data["visit_count"] = val
+        except:
+            pass
+    return data
+
+
+# ============================================================
+# 并行抓取问题详情
+# ============================================================
+def _reorder(emit):
+    """按序号交出结果的小缓冲，返回 (put, flush)
+
+    put(i, item) 可以乱序、并发调用；emit(item) 按 i = 0, 1, 2... 依次调用，同一时刻
+    只有一个。先到的 item 暂存在以序号为键的字典里，等前面的序号到齐再交出。
+    flush() 把缓冲里剩下的（中间有空档时）照序交出。
+    """
+    state = {"next": 0, "ready": {}}
+    lock = threading.Lock()
+
+    def put(i, item):
+        with lock:
+            ready = state["ready"]
+            ready[i] = item
+            while state["next"] in ready:
+                emit(ready.pop(state["next"]))
+                state["next"] += 1
+
+    def flush():
+        with lock:
+            for i in sorted(state["ready"]):
+                emit(state["ready"].pop(i))
+
+    return put, flush
+
+
+def fetch_details(driver, jobs, workers=1, session=None, on_result=None, on_failed=None):
+    """并行抓取 jobs 中 (qid, keyword) 的详情，返回结果与 jobs 顺序一致
+
+    jobs 可以是列表，也可以是边搜边产出的迭代器（取完即结束）。
+    主 driver（可为 None）算一个 worker，其余 worker 按需各开一个 headless Chrome
+    并注入 Cookie；给了 session 时先走 HTTP，拿不到数据才用浏览器。
+    所有 worker 从同一个 jobs 取任务，请求节奏由 throttle() 全局控制。
+    给了 on_result 时结果不在内存里累积、返回空列表，改为经 _reorder 按 jobs 顺序逐个
+    调用 on_result(data, 耗时秒数)（在 worker 线程里，同一时刻只有一个调用）；
+    失败的问题不出现在结果里，给了 on_failed 时按同样的顺序调用 on_failed(qid, keyword)。
+    """
+    if isinstance(jobs, list):
+        workers = min(workers, max(1, len(jobs)))
+    pending = enumerate(jobs)
+    pending_lock = threading.Lock()
+    results = {}
+
+    def emit(item):
+        qid, kw, data, elapsed = item
+        try:
+            if data is not None:
+                on_result(data, elapsed)
+            elif on_failed is not None:
+                on_failed(qid, kw)
+        except Exception as e:
+            print(f"  ERROR qid={qid}: {e}")
+
+    deliver, flush = _reorder(emit)
+
+    def run(drv):
+        own = drv is None
+        try:
+            while True:
+                with pending_lock:
+                    job = next(pending, None)
+                if job is None:
+                    return
+                i, (qid, kw) = job
+                data = elapsed = None
+                try:
+                    started = time.monotonic()
+                    if session is not None:
+                        try:
+                            data = get_question_detail_http(session, qid)
+                        except requests.RequestException as e:
+                            print(f"  [HTTP] qid={qid}: {e}")
+                    if data is None:
+                        if drv is None:
+                            drv = setup_driver(headless=True)
+                            inject_cookies(drv)
+                        data = get_question_detail(drv, qid)
+                    data["keyword"] = kw
+                    elapsed = time.monotonic() - started
+                    print(f"  [{data['follower_count']}关注/{data['answer_count']}回答/{data['visit_count']}浏览] {data['title'][:55]}")
+                except Exception as e:
+                    print(f"  ERROR qid={qid}: {e}")
+                    data = None
+                if on_result is not None:
+                    deliver(i, (qid, kw, data, elapsed))
+                elif data is not None:
+                    results[i] = data
+        except Exception as e:
+            print(f"  [WARN] worker 异常退出: {e}")
+        finally:
+            if own and drv is not None:
+                drv.quit()
+
+    threads = [threading.Thread(target=run, args=(driver if n == 0 else None,), daemon=True)
+               for n in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    flush()  # worker 异常退出留下的空档：剩下的照序交出
+    return [results[i] for i in sorted(results)]
+
+
+# ============================================================
+# HTTP 搜索模式：关键词并发翻页搜索，问题 ID 一到就进入详情抓取
+# ============================================================
+def harvest_and_fetch(driver, session, keywords, journal, cache, max_age, workers, on_result, on_known):
+    """边搜边抓，返回去重后的问题总数
+
+    新抓到的问题交给 on_result(data, 耗时)；日志里已抓到的、缓存命中的问题不进抓取队列，
+    交给 on_known(data, keyword)。搜索接口拿不到结果的关键词，并发阶段结束后用浏览器搜索补上。
+
+    两种回调都按 (关键词顺序, 结果排名) 依次调用，与线程调度无关：每个问题记下最靠前的
+    一次出现，它的关键词也取那一次的。某个关键词及其之前的关键词都搜完后，它名下的问题
+    才排定序号，交给与 fetch_details 相同的 _reorder 缓冲；抓完、失败或命中日志/缓存的
+    结果先按 qid 暂存，等排到序号再交出。
+    """
+    sightings = {}  # qid -> (关键词序号, 排名, 关键词)，取最靠前的一次
+    finished = {}   # 关键词序号 -> 该关键词的 qid 列表（搜索结束后才有）
+    parked = {}     # 已有结果、还没排到序号的 qid -> 结果
+    seq_of = {}     # 已排定序号、结果还没到的 qid -> 序号
+    order = {"kw": 0, "seq": 0}
+    lock = threading.Lock()
+    failed = []
+    work = queue.Queue()
+
+    def emit(item):
+        kind, data, extra = item
+        try:
+            if kind == "known":
+                on_known(data, extra)
+            elif kind == "new":
+                on_result(data, extra)
+        except Exception as e:
+            print(f"  ERROR qid={data.get('id') if data else ''}: {e}")
+
+    put, flush = _reorder(emit)
+
+    def settle(qid, result):
+        """result 为 (kind, data, 耗时)；按 qid 最终归属的关键词改写后交出"""
+        kind, data, elapsed = result
+        kw = sightings[qid][2]
+        if kind == "new":
+            data["keyword"] = kw
+            return kind, data, elapsed
+        return kind, data, kw
+
+    def arrive(qid, result):
+        with lock:
+            if qid in seq_of:
+                put(seq_of.pop(qid), settle(qid, result))
+            else:
+                parked[qid] = result
+
+    def finish(kw_idx, qids):
+        """关键词搜索结束：从最前面未排序的关键词起，把已搜完的依次排定序号"""
+        with lock:
+            finished[kw_idx] = qids
+            while order["kw"] in finished:
+                k = order["kw"]
+                for rank, qid in enumerate(finished.pop(k)):
+                    if sightings[qid][:2] != (k, rank):
+                        continue
+                    seq = order["seq"]
+                    order["seq"] += 1
+                    if qid in parked:
+                        put(seq, settle(qid, parked.pop(qid)))
+                    else:
+                        seq_of[qid] = seq
+                order["kw"] += 1
+
+    def submit(kw_idx, rank, qid, kw):
+        with lock:
+            first = qid not in sightings
+            if first or (kw_idx, rank) < sightings[qid][:2]:
+                sightings[qid] = (kw_idx, rank, kw)
+        if not first:
+            return
+        if qid in journal["fetched"]:
+            arrive(qid, ("known", journal["fetched"][qid], None))
+            return
+        hit = cache_lookup(cache, [qid], max_age)
+        if hit:
+            arrive(qid, ("known", hit[qid], None))
+        else:
+            work.put((qid, kw))
+
+    def harvest(kw_idx, kw):
+        qids = journal["searched"].get(kw)
+        if qids is not None:
+            for rank, qid in enumerate(qids):
+                submit(kw_idx, rank, qid, kw)
+            finish(kw_idx, qids)
+            return
+        qids = []
+        try:
+            for qid in search_keyword_api(session, kw):
+                submit(kw_idx, len(qids), qid, kw)
+                qids.append(qid)
+        except (requests.RequestException, ValueError) as e:
+            print(f"  [搜索接口] {kw}: {e}")
+        if qids:
+            print(f"\n[搜索] {kw}: {len(qids)} 个问题")
+            journal_append(journal, {"type": "search", "keyword": kw, "qids": qids})
+            finish(kw_idx, qids)
+        else:
+            failed.append((kw_idx, kw))
+
+    def drain():
+        while True:
+            job = work.get()
+            if job is None:
+                return
+            yield job
+
+    def produce(targets):
+        threads = [threading.Thread(target=harvest, args=target, daemon=True) for target in targets]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        work.put(None)
+
+    def fetch():
+        fetch_details(driver, drain(), workers=workers, session=session,
+                      on_result=lambda data, elapsed: arrive(data["id"], ("new", data, elapsed)),
+                      on_failed=lambda qid, kw: arrive(qid, ("failed", None, None)))
+
+    producer = threading.Thread(target=produce, args=(list(enumerate(keywords)),), daemon=True)
+    producer.start()
+    fetch()
+    producer.join()
+
+    if failed:
+        if driver is not None:
+            print(f"\n[搜索] {len(failed)} 个关键词改用浏览器搜索")
+        for kw_idx, kw in sorted(failed):
+            qids = []
+            if driver is not None:
+                qids = search_keyword(driver, kw)
+                journal_append(journal, {"type": "search", "keyword": kw, "qids": qids})
+                for rank, qid in enumerate(qids):
+                    submit(kw_idx, rank, qid, kw)
+            finish(kw_idx, qids)
+        work.put(None)
+        fetch()
+
+    flush()
+    return len(sightings)
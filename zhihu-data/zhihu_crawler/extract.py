@@ -0,0 +1,174 @@
+"""
+页面提取器：问题 / 专栏文章 / 回答
+
+知乎页面是服务端渲染的，数据都在 js-initialData 里；每种页面一个提取器，
+签名统一为 extractor(page, id) -> dict 或 None，登记在 EXTRACTORS 中。
+"""
+import json
+import re
+from datetime import datetime
+
+_INITIAL_DATA_RE = re.compile(
+    r'<script[^>]*\bid="js-initialData"[^>]*>(.*?)</script>', re.S)
+
+
+def parse_number(text):
+    """解析 '1,234' / '1.2 万' / '1.2万' 格式"""
+    if not text:
+        return 0
+    text = text.strip().replace(",", "").replace(" ", "").replace("\n", "")
+    if "万" in text:
+        try:
+            return int(float(text.replace("万", "")) * 10000)
+        except:
+            return 0
+    if "亿" in text:
+        try:
+            return int(float(text.replace("亿", "")) * 100000000)
+        except:
+            return 0
+    try:
+        return int(text)
+    except:
+        return 0
+
+
+def initial_entities(page):
+    """解析 js-initialData，返回 initialState.entities；没有或不是 JSON 时返回 None"""
+    m = _INITIAL_DATA_RE.search(page)
+    if not m:
+        return None
+    try:
+        state = json.loads(m.group(1))
+    except ValueError:
+        return None
+    return state.get("initialState", {}).get("entities", {})
+
+
+def _date(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d") if timestamp else ""
+
+
+# ============================================================
+# 问题
+# ============================================================
+def parse_initial_data(html, qid):
+    """从问题页 HTML 的 js-initialData 中解析问题记录；结构不符时返回 None"""
+    question = (initial_entities(html) or {}).get("questions", {}).get(str(qid))
+    if not question or not question.get("title"):
+        return None
+    return {
+        "id": str(qid),
+        "title": question["title"].strip(),
+        "follower_count": int(question.get("followerCount") or 0),
+        "answer_count": int(question.get("answerCount") or 0),
+        "visit_count": int(question.get("visitCount") or 0),
+        "url": f"https://www.zhihu.com/question/{qid}",
+    }
+
+
+# 一次扫描同时找 <title>、JSON 字段和"个回答"，每项只取第一次出现。
+# 各分支都以字面量开头（< " 个），正则引擎可以快速跳过无关字符；
+# "N 个回答"的数字在命中后往回取，避免以 \d 开头的分支拖慢整个扫描
+_METRIC_RE = re.compile(
+    r'<title[^>]*>(?P<page_title>.*?)\s*-\s*知乎</title>'
+    r'|"(?P<key>followerCount|visitCount|answerCount|title)"\s*:\s*(?:(?P<num>\d+)|"(?P<text>[^"]{5,})")'
+    r'|(?P<answer_text>个回答)'
+)
+_METRIC_KEYS = ("page_title", "followerCount", "visitCount", "answerCount", "title", "answer_text")
+_TRAILING_NUMBER_RE = re.compile(r'(\d[\d,]*)\s*$')
+_UNREAD_PREFIX_RE = re.compile(r'^\(\d+\s*[^)]*\)\s*')  # "(3 封私信) 标题"
+
+
+def scan_page_metrics(page):
+    """单次扫描 page，返回 {字段: 第一次出现的原始值}；全部找到即停止"""
+    found = {}
+    for m in _METRIC_RE.finditer(page):
+        group = m.lastgroup
+        if group == "page_title":
+            key, value = group, m.group(group)
+        elif group == "answer_text":
+            n = _TRAILING_NUMBER_RE.search(page, max(0, m.start() - 32), m.start())
+            key, value = group, n and n.group(1)
+        else:
+            key = m.group("key")
+            value = m.group("text") if key == "title" else m.group("num")
+        if value and key not in found:
+            found[key] = value
+            if len(found) == len(_METRIC_KEYS):
+                break
+    return found
+
+
+def extract_page_metrics(page, qid):
+    """从问题页 HTML 提取问题记录：优先 js-initialData，否则单次正则扫描
+
+    标题取不到时 title 为空串，由调用方决定是否再查 DOM。
+    """
+    data = parse_initial_data(page, qid)
+    if data:
+        return data
+    found = scan_page_metrics(page)
+    title = _UNREAD_PREFIX_RE.sub("", (found.get("page_title") or "").strip())
+    if "answer_text" in found:
+        answer_count = parse_number(found["answer_text"])
+    else:
+        answer_count = int(found.get("answerCount") or 0)
+    return {
+        "id": str(qid),
+        "title": title or found.get("title", ""),
+        "follower_count": int(found.get("followerCount") or 0),
+        "answer_count": answer_count,
+        "visit_count": int(found.get("visitCount") or 0),
+        "url": f"https://www.zhihu.com/question/{qid}",
+    }
+
+
+# ============================================================
+# 专栏文章与回答
+# ============================================================
+def extract_article(page, article_id):
+    """专栏文章页 -> {id, title, content(HTML), voteup_count, comment_count, date, url}"""
+    article = (initial_entities(page) or {}).get("articles", {}).get(str(article_id))
+    if not article:
+        return None
+    return {
+        "id": str(article_id),
+        "title": article.get("title", "").strip(),
+        "content": article.get("content", ""),
+        "voteup_count": int(article.get("voteupCount") or 0),
+        "comment_count": int(article.get("commentCount") or 0),
+        "date": _date(article.get("created")),
+        "url": f"https://zhuanlan.zhihu.com/p/{article_id}",
+    }
+
+
+def extract_answer(page, answer_id):
+    """回答页 -> {id, question_id, title(问题标题), content(HTML), voteup_count, comment_count, date, url}"""
+    answer = (initial_entities(page) or {}).get("answers", {}).get(str(answer_id))
+    if not answer:
+        return None
+    question = answer.get("question") or {}
+    qid = str(question.get("id", ""))
+    return {
+        "id": str(answer_id),
+        "question_id": qid,
+        "title": question.get("title", "").strip(),
+        "content": answer.get("content", ""),
+        "voteup_count": int(answer.get("voteupCount") or 0),
+        "comment_count": int(answer.get("commentCount") or 0),
+        "date": _date(answer.get("createdTime")),
+        "url": f"https://www.zhihu.com/question/{qid}/answer/{answer_id}",
+    }
+
+
+EXTRACTORS = {
+    "question": extract_page_metrics,
+    "article": extract_article,
+    "answer": extract_answer,
+}
+
+
+def extract(kind, page, item_id):
+    """按页面类型分派到对应提取器"""
+    return EXTRACTORS[kind](page, item_id)
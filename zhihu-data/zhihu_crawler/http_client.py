@@ -0,0 +1,71 @@
+"""
+HTTP 模式：不开浏览器，用带登录 Cookie 的 requests 会话抓问题页和搜索接口
+"""
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import (
+    COOKIE_STR, HTTP_TIMEOUT, MAX_QUESTIONS_PER_KEYWORD, SEARCH_API, SEARCH_PAGE_SIZE, USER_AGENT,
+)
+from .extract import parse_initial_data
+from .pacing import throttle
+
+
+def make_session(pool_size=4):
+    """带 COOKIE_STR 登录态的 requests 会话，连接池大小与 worker 数一致"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Referer": "https://www.zhihu.com/"})
+    for cookie_pair in COOKIE_STR.split("; "):
+        if "=" in cookie_pair:
+            name, value = cookie_pair.split("=", 1)
+            session.cookies.set(name.strip(), value.strip(), domain=".zhihu.com")
+    return session
+
+
+def get_question_detail_http(session, qid):
+    """HTTP 抓取问题详情；被重定向到验证页或解析失败时返回 None，由调用方回退到浏览器"""
+    throttle()
+    resp = session.get(f"https://www.zhihu.com/question/{qid}", timeout=HTTP_TIMEOUT)
+    if resp.status_code != 200:
+        return None
+    resp.encoding = "utf-8"
+    return parse_initial_data(resp.text, qid)
+
+
+def _search_item_qid(item):
+    """搜索接口的一条结果 -> 问题 ID；回答类结果取其所属问题，其他类型返回 None"""
+    obj = item.get("object") or {}
+    if obj.get("type") == "question":
+        return str(obj["id"]) if obj.get("id") else None
+    question = obj.get("question") or {}
+    return str(question["id"]) if question.get("id") else None
+
+
+def search_keyword_api(session, keyword, max_questions=MAX_QUESTIONS_PER_KEYWORD):
+    """按 offset/limit 翻页调用搜索接口，逐个产出去重后的问题 ID
+
+    结果数量由接口决定，不受页面滚动快慢影响；接口返回非 200 时抛 requests.HTTPError。
+    """
+    seen = set()
+    offset = 0
+    while len(seen) < max_questions:
+        throttle()
+        resp = session.get(SEARCH_API, timeout=HTTP_TIMEOUT, params={
+            "t": "general", "q": keyword, "correction": 1,
+            "offset": offset, "limit": SEARCH_PAGE_SIZE,
+        })
+        resp.raise_for_status()
+        payload = resp.json()
+        items = payload.get("data") or []
+        for item in items:
+            qid = _search_item_qid(item)
+            if qid and qid not in seen:
+                seen.add(qid)
+                yield qid
+                if len(seen) >= max_questions:
+                    return
+        if not items or payload.get("paging", {}).get("is_end", True):
+            return
+        offset += len(items)
@@ -0,0 +1,282 @@
+"""
+知乎问题指标时序库 - 每次抓取的关注/回答/浏览数按 (问题, 时间) 追加一行，
+跨多次快照计算增长速度，找出"关注在涨、回答还少"的问题
+
+用法：
+  python zhihu_metrics.py rising                 # 最近 30 天增长最快的低竞争问题
+  python zhihu_metrics.py rising --days 7 --top 50
+  python zhihu_metrics.py ingest                 # 导入目录下所有 zhihu_questions_*.csv 快照
+  python zhihu_metrics.py query --min-ratio 3 --min-followers 30 --keyword AI
+  python zhihu_metrics.py query --sort visit_count --limit 50 --all   # --all：包含每个问题的历史快照
+"""
+import csv
+import glob
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+from .config import DATA_DIR
+
+
+# ============================================================
+# 配置
+# ============================================================
+METRICS_DB = os.path.join(DATA_DIR, "zhihu_metrics.sqlite3")
+SNAPSHOT_GLOB = "zhihu_questions_*.csv"
+SORT_COLUMNS = ("ratio", "follower_count", "answer_count", "visit_count", "snapshot_ts")
+MIN_RATIO = 3          # 关注/回答比下限，与 print_summary 的候选条件一致
+MIN_FOLLOWERS = 30
+
+
+# ============================================================
+# 存储：observations 每行一个观测，qid/ts 都是整数，(qid, ts) 为主键
+# ============================================================
+def open_store(path=METRICS_DB):
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE IF NOT EXISTS observations ("
+        " qid INTEGER NOT NULL, ts INTEGER NOT NULL,"
+        " followers INTEGER NOT NULL, answers INTEGER NOT NULL, visits INTEGER NOT NULL,"
+        " PRIMARY KEY (qid, ts)) WITHOUT ROWID;"
+        "CREATE INDEX IF NOT EXISTS observations_ts ON observations (ts);"
+        "CREATE TABLE IF NOT EXISTS titles (qid INTEGER PRIMARY KEY, title TEXT);"
+        # CSV 快照原样入库，列与 zhihu_search_tool 输出的 CSV 一致
+        "CREATE TABLE IF NOT EXISTS snapshots ("
+        " id INTEGER NOT NULL, snapshot_ts INTEGER NOT NULL, keyword TEXT, title TEXT,"
+        " follower_count INTEGER, answer_count INTEGER, visit_count INTEGER, ratio REAL,"
+        " url TEXT, source TEXT,"
+        " PRIMARY KEY (id, snapshot_ts)) WITHOUT ROWID;"
+        "CREATE INDEX IF NOT EXISTS snapshots_keyword ON snapshots (keyword);"
+        "CREATE INDEX IF NOT EXISTS snapshots_ratio ON snapshots (ratio);"
+        "CREATE INDEX IF NOT EXISTS snapshots_followers ON snapshots (follower_count);"
+    )
+    return conn
+
+
+def record_observations(questions, ts=None, path=METRICS_DB):
+    """把一批抓取结果（zhihu_search_tool 的问题记录格式）记为同一时刻的观测"""
+    if not questions:
+        return
+    ts = int(ts if ts is not None else time.time())
+    conn = open_store(path)
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO observations VALUES (?, ?, ?, ?, ?)",
+            [(int(q["id"]), ts, q["follower_count"], q["answer_count"], q["visit_count"])
+             for q in questions],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO titles VALUES (?, ?)",
+            [(int(q["id"]), q["title"]) for q in questions if q.get("title")],
+        )
+    conn.close()
+
+
+def load_observations(since=None, path=METRICS_DB):
+    """读出观测为 DataFrame，since 为起始时间戳（秒）"""
+    conn = open_store(path)
+    query = "SELECT qid, ts, followers, answers, visits FROM observations"
+    params = ()
+    if since is not None:
+        query += " WHERE ts >= ?"
+        params = (int(since),)
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    return df
+
+
+# ============================================================
+# CSV 快照导入与查询
+# ============================================================
+def snapshot_time(path):
+    """zhihu_questions_YYYYMMDD_HHMMSS.csv -> 时间戳；文件名不符时用修改时间"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    try:
+        return int(datetime.strptime(stem[-15:], "%Y%m%d_%H%M%S").timestamp())
+    except ValueError:
+        return int(os.path.getmtime(path))
+
+
+def ingest_snapshots(paths=None, path=METRICS_DB):
+    """把 CSV 快照批量导入 snapshots 表；同一文件重复导入是幂等的，返回导入行数"""
+    if paths is None:
+        paths = sorted(glob.glob(os.path.join(DATA_DIR, SNAPSHOT_GLOB)))
+    conn = open_store(path)
+    total = 0
+    with conn:
+        for csv_path in paths:
+            ts = snapshot_time(csv_path)
+            with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+                rows = [
+                    (int(r["id"]), ts, r["keyword"], r["title"],
+                     int(r["follower_count"] or 0), int(r["answer_count"] or 0),
+                     int(r["visit_count"] or 0), float(r["ratio"] or 0),
+                     r["url"], os.path.basename(csv_path))
+                    for r in csv.DictReader(f) if r.get("id")
+                ]
+            conn.executemany(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            total += len(rows)
+    conn.close()
+    return total
+
+
+def query_snapshots(min_ratio=None, min_followers=None, keyword=None, sort="ratio",
+                    limit=20, latest_only=True, path=METRICS_DB):
+    """按条件筛选快照，返回 DataFrame；latest_only 时每个问题只取最新一次快照"""
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"sort 只能是 {SORT_COLUMNS}")
+    where, params = [], []
+    if min_ratio is not None:
+        where.append("ratio > ?")
+        params.append(min_ratio)
+    if min_followers is not None:
+        where.append("follower_count > ?")
+        params.append(min_followers)
+    if keyword:
+        where.append("keyword LIKE ?")
+        params.append(f"%{keyword}%")
+    if latest_only:
+        where.append("snapshot_ts = (SELECT MAX(snapshot_ts) FROM snapshots s2 WHERE s2.id = s.id)")
+    query = ("SELECT id, snapshot_ts, keyword, title, follower_count, answer_count,"
+             " visit_count, ratio, url FROM snapshots s")
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += f" ORDER BY {sort} DESC LIMIT ?"
+    params.append(int(limit))
+    conn = open_store(path)
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    return df
+
+
+# ============================================================
+# 查询：增长速度与排名（全部向量化，不逐行循环）
+# ============================================================
+def growth_rates(obs):
+    """每个问题首末两次观测之间的日均关注/浏览增长
+
+    返回以 qid 为索引的 DataFrame：followers/answers/visits 取最新值，
+    follower_rate、visit_rate 为每天增量，span_days 为首末间隔；只观测到一次的问题不在结果里。
+    """
+    obs = obs.sort_values(["qid", "ts"], kind="stable")
+    grouped = obs.groupby("qid", sort=False)
+    first = grouped.first()
+    last = grouped.last()
+    span_days = (last["ts"] - first["ts"]).to_numpy() / 86400.0
+    keep = span_days > 0
+    rates = last.loc[keep, ["followers", "answers", "visits"]].copy()
+    days = span_days[keep]
+    rates["span_days"] = days
+    rates["follower_rate"] = (last["followers"].to_numpy()[keep] - first["followers"].to_numpy()[keep]) / days
+    rates["visit_rate"] = (last["visits"].to_numpy()[keep] - first["visits"].to_numpy()[keep]) / days
+    rates["ratio"] = rates["followers"] / np.maximum(rates["answers"], 1)
+    return rates
+
+
+def rank_rising(obs, top=20, min_ratio=MIN_RATIO, min_followers=MIN_FOLLOWERS):
+    """关注在涨、回答还少的问题：score = 日均新增关注 / (回答数 + 1)"""
+    rates = growth_rates(obs)
+    rates = rates[(rates["ratio"] > min_ratio)
+                  & (rates["followers"] > min_followers)
+                  & (rates["follower_rate"] > 0)]
+    rates = rates.assign(score=rates["follower_rate"] / (rates["answers"] + 1))
+    return rates.nlargest(top, "score")
+
+
+def attach_titles(ranked, path=METRICS_DB):
+    conn = open_store(path)
+    titles = pd.read_sql_query("SELECT qid, title FROM titles", conn).set_index("qid")["title"]
+    conn.close()
+    return ranked.join(titles)
+
+
+# ============================================================
+# 命令行
+# ============================================================
+def print_rising(ranked):
+    if ranked.empty:
+        print("没有足够的多次观测（同一问题至少需要两次抓取）")
+        return
+    for i, (qid, r) in enumerate(ranked.iterrows(), 1):
+        print(f"\n#{i} {r.get('title') or ''}")
+        print(f"  关注:{r['followers']} (+{r['follower_rate']:.1f}/天) | 回答:{r['answers']} | "
+              f"浏览:{r['visits']} (+{r['visit_rate']:.0f}/天) | 比值:{r['ratio']:.1f} | "
+              f"跨度:{r['span_days']:.1f}天")
+        print(f"  https://www.zhihu.com/question/{qid}")
+
+
+def print_snapshots(df):
+    for r in df.itertuples(index=False):
+        day = datetime.fromtimestamp(r.snapshot_ts).strftime("%Y-%m-%d %H:%M")
+        print(f"\n[{r.keyword}] {r.title}")
+        print(f"  关注:{r.follower_count} | 回答:{r.answer_count} | 浏览:{r.visit_count} | "
+              f"比值:{r.ratio:.1f} | 快照:{day}")
+        print(f"  {r.url}")
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ("rising", "ingest", "query"):
+        print(__doc__)
+        return
+    command = args[0]
+    if command == "ingest":
+        paths = args[1:] or None
+        print(f"[导入] {ingest_snapshots(paths)} 行 -> {METRICS_DB}")
+        return
+
+    days = 30
+    top = 20
+    filters = {"min_ratio": None, "min_followers": None, "keyword": None,
+               "sort": "ratio", "limit": 20, "latest_only": True}
+    i = 1
+    while i < len(args):
+        if args[i] == "--all":
+            filters["latest_only"] = False
+            i += 1
+        elif i + 1 >= len(args):
+            i += 1
+        elif args[i] == "--days":
+            days = float(args[i + 1])
+            i += 2
+        elif args[i] == "--top":
+            top = int(args[i + 1])
+            i += 2
+        elif args[i] == "--min-ratio":
+            filters["min_ratio"] = float(args[i + 1])
+            i += 2
+        elif args[i] == "--min-followers":
+            filters["min_followers"] = int(args[i + 1])
+            i += 2
+        elif args[i] == "--keyword":
+            filters["keyword"] = args[i + 1]
+            i += 2
+        elif args[i] == "--sort":
+            filters["sort"] = args[i + 1]
+            i += 2
+        elif args[i] == "--limit":
+            filters["limit"] = int(args[i + 1])
+            i += 2
+        else:
+            i += 1
+
+    if command == "rising":
+        obs = load_observations(since=time.time() - days * 86400)
+        print_rising(attach_titles(rank_rising(obs, top=top)))
+    else:
+        started = time.perf_counter()
+        df = query_snapshots(**filters)
+        elapsed = (time.perf_counter() - started) * 1000
+        print_snapshots(df)
+        print(f"\n[查询] {len(df)} 行，{elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
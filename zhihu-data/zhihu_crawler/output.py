@@ -0,0 +1,143 @@
+"""
+结果输出：边抓边写 CSV（可选 Parquet），汇总只保留 top-K
+"""
+import csv
+import heapq
+import os
+import threading
+from datetime import datetime
+
+from .config import OUTPUT_DIR, PARQUET_BATCH, SUMMARY_TOP_K
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet 输出是可选的
+    pa = pq = None
+
+PARQUET_SCHEMA = pa.schema([
+    ("keyword", pa.string()), ("title", pa.string()),
+    ("follower_count", pa.int64()), ("answer_count", pa.int64()), ("visit_count", pa.int64()),
+    ("ratio", pa.float64()), ("url", pa.string()), ("id", pa.string()),
+]) if pa is not None else None
+
+
+CSV_FIELDS = ["keyword", "title", "follower_count", "answer_count",
+              "visit_count", "ratio", "url", "id"]
+
+
+def open_sink(filename=None, parquet=False):
+    """打开输出：每条结果到达即追加一行并 flush，中途中断也留下可用的部分结果
+
+    汇总所需的排名用定长小顶堆维护，内存不随抓取量增长。
+    parquet=True 时另写一份同名 .parquet（需要 pyarrow），按 PARQUET_BATCH 行一组写入；
+    写第一组时才创建文件，没有结果就不会留下空的 .parquet。
+    """
+    if not filename:
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(OUTPUT_DIR, f"zhihu_questions_{ts}.csv")
+    f = open(filename, "w", encoding="utf-8-sig", newline="")
+    writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    f.flush()
+    sink = {
+        "path": filename, "file": f, "writer": writer, "lock": threading.Lock(),
+        "count": 0, "seq": 0,
+        "top_followers": [],   # (follower_count, seq, row)
+        "top_candidates": [],  # (ratio, seq, row)，只含符合候选条件的
+        "parquet": None, "parquet_writer": None, "parquet_rows": [],
+    }
+    if parquet:
+        if pa is None:
+            print("[WARN] 未安装 pyarrow，跳过 Parquet 输出")
+        else:
+            sink["parquet"] = os.path.splitext(filename)[0] + ".parquet"
+    return sink
+
+
+def _push_top(heap, key, seq, row, k=SUMMARY_TOP_K):
+    if len(heap) < k:
+        heapq.heappush(heap, (key, seq, row))
+    elif key > heap[0][0]:
+        heapq.heapreplace(heap, (key, seq, row))
+
+
+def _flush_parquet(sink):
+    rows = sink["parquet_rows"]
+    if sink["parquet"] is not None and rows:
+        if sink["parquet_writer"] is None:
+            sink["parquet_writer"] = pq.ParquetWriter(sink["parquet"], PARQUET_SCHEMA)
+        sink["parquet_writer"].write_table(pa.Table.from_pylist(rows, schema=PARQUET_SCHEMA))
+    sink["parquet_rows"] = []
+
+
+def sink_write(sink, q):
+    """写入一条结果；ratio 只在这里算一次，之后汇总和 Parquet 都复用"""
+    row = {k: q.get(k) for k in CSV_FIELDS if k != "ratio"}
+    row["ratio"] = q["follower_count"] / max(q["answer_count"], 1)
+    with sink["lock"]:
+        sink["writer"].writerow({**row, "ratio": f"{row['ratio']:.1f}"})
+        sink["file"].flush()
+        sink["count"] += 1
+        sink["seq"] += 1
+        _push_top(sink["top_followers"], row["follower_count"], sink["seq"], row)
+        if row["follower_count"] > 30 and row["ratio"] > 3:
+            _push_top(sink["top_candidates"], row["ratio"], sink["seq"], row)
+        if sink["parquet"] is not None:
+            sink["parquet_rows"].append(row)
+            if len(sink["parquet_rows"]) >= PARQUET_BATCH:
+                _flush_parquet(sink)
+
+
+def close_sink(sink):
+    """关闭输出，返回 CSV 路径；没有写入任何结果时删除空文件并返回 None"""
+    sink["file"].close()
+    _flush_parquet(sink)
+    if sink["parquet_writer"] is not None:
+        sink["parquet_writer"].close()
+    if sink["count"] == 0:
+        os.remove(sink["path"])
+        return None
+    print(f"\n[保存] {sink['count']} 条结果已写入: {sink['path']}")
+    return sink["path"]
+
+
+def _ranked(heap):
+    """堆 -> 按 key 从大到小；同 key 按写入先后"""
+    return [row for _, _, row in sorted(heap, key=lambda item: (-item[0], item[1]))]
+
+
+def _print_question(i, q):
+    print(f"\n#{i} [{q.get('keyword','')}]")
+    print(f"  {q['title']}")
+    print(f"  关注:{q['follower_count']} | 回答:{q['answer_count']} | 浏览:{q['visit_count']} | 比值:{q['ratio']:.1f}")
+    print(f"  {q['url']}")
+
+
+def print_summary(sink):
+    """打印汇总（取自 sink 维护的 top-K，不再对全部结果排序）"""
+    top_followers = _ranked(sink["top_followers"])
+    print("\n" + "=" * 80)
+    print(f"=== 关注数最高的 {len(top_followers)} 个问题（共 {sink['count']} 个）===")
+    print("=" * 80)
+    
+    for q in top_followers:
+        print(f"[{q.get('keyword','')}] 关注:{q['follower_count']} 回答:{q['answer_count']} 浏览:{q['visit_count']} 比值:{q['ratio']:.1f}")
+        print(f"  {q['title']}")
+        print(f"  {q['url']}")
+        print()
+    
+    # 筛选候选
+    print("=" * 80)
+    print("=== 候选问题（高关注 + 低竞争）===")
+    print("=== 条件：关注>30 且 关注/回答比>3 ===")
+    print("=" * 80)
+    
+    candidates = _ranked(sink["top_candidates"])
+    if candidates:
+        for i, q in enumerate(candidates, 1):
+            _print_question(i, q)
+    else:
+        print("\n没有符合严格条件的问题。以下是关注数最高的前10个：")
+        for i, q in enumerate(top_followers[:10], 1):
+            _print_question(i, q)
@@ -0,0 +1,24 @@
+"""
+全局限速：浏览器和 HTTP 请求共用一个节奏
+"""
+import threading
+import time
+
+from .config import BETWEEN_REQUESTS_WAIT
+
+_next_request_at = 0.0
+_throttle_lock = threading.Lock()
+
+
+def throttle():
+    """全局限速：所有线程的请求之间至少间隔 BETWEEN_REQUESTS_WAIT 秒
+
+    在锁内预约下一个发送时刻，锁外睡眠，多个 worker 排队而不是同时醒来。
+    """
+    global _next_request_at
+    with _throttle_lock:
+        now = time.monotonic()
+        slot = max(now, _next_request_at)
+        _next_request_at = slot + BETWEEN_REQUESTS_WAIT
+    if slot > now:
+        time.sleep(slot - now)
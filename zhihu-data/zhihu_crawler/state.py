@@ -0,0 +1,124 @@
+"""
+抓取状态：断点续抓日志（JSONL）与跨运行的问题缓存（SQLite）
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .config import CACHE_MAX_AGE_HOURS, HOT_FOLLOWERS, QUESTION_CACHE_DB, STATE_DIR
+
+
+# ============================================================
+# 断点续抓：追加写的 JSONL 日志，每条记录写完即 flush
+# ============================================================
+def open_journal(task, fresh=False):
+    """打开 task（本次运行的参数）对应的日志，回放已有记录
+
+    记录两种：{"type": "search", "keyword", "qids"} 表示关键词已搜完；
+    {"type": "question", "data"} 表示问题详情已抓到。崩溃时可能写了半行，回放时跳过。
+    """
+    os.makedirs(STATE_DIR, exist_ok=True)
+    key = hashlib.sha1(json.dumps(task, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(STATE_DIR, f"{key}.jsonl")
+    journal = {"path": path, "lock": threading.Lock(), "searched": {}, "fetched": {}}
+    if fresh and os.path.exists(path):
+        os.remove(path)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("type") == "search":
+                    journal["searched"][record["keyword"]] = record["qids"]
+                elif record.get("type") == "question":
+                    journal["fetched"][record["data"]["id"]] = record["data"]
+        if journal["searched"] or journal["fetched"]:
+            print(f"[续抓] 已搜索 {len(journal['searched'])} 个关键词，已抓到 {len(journal['fetched'])} 个问题")
+    journal["file"] = open(path, "a", encoding="utf-8")
+    return journal
+
+
+def journal_append(journal, record):
+    """追加一条记录并立即 flush；worker 线程并发调用"""
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with journal["lock"]:
+        journal["file"].write(line)
+        journal["file"].flush()
+
+
+def close_journal(journal, done=False):
+    """关闭日志；done=True（结果已保存）时删除，下次同样参数会重新抓取"""
+    journal["file"].close()
+    if done:
+        os.remove(journal["path"])
+
+
+# ============================================================
+# 跨运行的问题缓存：qid -> 最近一次抓到的详情
+# ============================================================
+QUESTION_FIELDS = ("id", "title", "follower_count", "answer_count", "visit_count", "url")
+
+
+def open_cache(path=QUESTION_CACHE_DB):
+    """打开问题缓存；worker 线程共用一个连接，写入由锁串行化"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS questions ("
+        " id TEXT PRIMARY KEY, title TEXT, follower_count INTEGER,"
+        " answer_count INTEGER, visit_count INTEGER, url TEXT,"
+        " fetched_at REAL, fetch_seconds REAL)"
+    )
+    return {"conn": conn, "lock": threading.Lock(), "hits": 0, "misses": 0, "saved_seconds": 0.0}
+
+
+def cache_max_age(entry, max_age_hours):
+    """热门问题变化快，有效期缩短"""
+    hours = max_age_hours / 4 if entry["follower_count"] >= HOT_FOLLOWERS else max_age_hours
+    return hours * 3600
+
+
+def cache_lookup(cache, qids, max_age_hours=CACHE_MAX_AGE_HOURS):
+    """返回 {qid: 详情}，只含未过期的；同时累计命中统计（多个搜索线程会同时调用，统计也在锁内更新）"""
+    if max_age_hours <= 0 or not qids:
+        with cache["lock"]:
+            cache["misses"] += len(qids)
+        return {}
+    now = time.time()
+    placeholders = ",".join("?" * len(qids))
+    with cache["lock"]:
+        rows = cache["conn"].execute(
+            f"SELECT {', '.join(QUESTION_FIELDS)}, fetched_at, fetch_seconds"
+            f" FROM questions WHERE id IN ({placeholders})", list(qids)
+        ).fetchall()
+        fresh = {}
+        for row in rows:
+            entry = dict(zip(QUESTION_FIELDS, row[:len(QUESTION_FIELDS)]))
+            fetched_at, fetch_seconds = row[len(QUESTION_FIELDS):]
+            if now - fetched_at <= cache_max_age(entry, max_age_hours):
+                fresh[entry["id"]] = entry
+                cache["saved_seconds"] += fetch_seconds or 0.0
+        cache["hits"] += len(fresh)
+        cache["misses"] += len(qids) - len(fresh)
+    return fresh
+
+
+def cache_put(cache, data, fetch_seconds):
+    with cache["lock"]:
+        cache["conn"].execute(
+            "INSERT OR REPLACE INTO questions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [data[k] for k in QUESTION_FIELDS] + [time.time(), fetch_seconds],
+        )
+        cache["conn"].commit()
+
+
+def cache_report(cache):
+    total = cache["hits"] + cache["misses"]
+    if total:
+        print(f"[缓存] 命中 {cache['hits']}/{total} ({cache['hits'] / total:.0%})，"
+              f"节省约 {cache['saved_seconds']:.0f} 秒")
@@ -0,0 +1,15 @@
+"""
+知乎问题指标时序库 - 每次抓取的关注/回答/浏览数按 (问题, 时间) 追加一行，
+跨多次快照计算增长速度，找出"关注在涨、回答还少"的问题
+
+用法：
+  python zhihu_metrics.py rising                 # 最近 30 天增长最快的低竞争问题
+  python zhihu_metrics.py rising --days 7 --top 50
+  python zhihu_metrics.py ingest                 # 导入目录下所有 zhihu_questions_*.csv 快照
+  python zhihu_metrics.py query --min-ratio 3 --min-followers 30 --keyword AI
+  python zhihu_metrics.py query --sort visit_count --limit 50 --all   # --all：包含每个问题的历史快照
+"""
+from zhihu_crawler.metrics import main
+
+if __name__ == "__main__":
+    main()
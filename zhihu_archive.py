@@ -0,0 +1,442 @@
+"""
+知乎存档检索 - 对 zhihu-data 下抓取的回答/文章和 articles/ 草稿建全文索引：
+中文按重叠二元组切分后存进 SQLite FTS5（倒排索引落盘），按文件修改时间增量更新。
+看板的「🔎 存档检索」页和命令行共用这一份索引。
+
+另外只读每个回答/文章文件开头的头部块（标题、日期、赞同、评论、链接），
+汇总成一张列式元数据表，用来重新生成各存档的 index.md，也供看板按日期/赞同/评论排序浏览。
+
+用法：
+  python zhihu_archive.py index                 # 增量更新索引（只重新切分新增/改过的文件）
+  python zhihu_archive.py search 大模型 成本     # 多个词之间为"且"
+  python zhihu_archive.py search Gemini --limit 5
+  python zhihu_archive.py meta                  # 刷新元数据表，按赞同数列出前 20
+  python zhihu_archive.py index-md              # 用元数据表重新生成各存档的 index.md
+  python zhihu_archive.py index-md --stdout     # 只打印，不写文件
+"""
+import argparse
+import csv
+import hashlib
+import html
+import operator
+import pathlib
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 没有 pyarrow 时元数据表存成 CSV
+    pa = pq = None
+
+# ============================================================
+# 配置
+# ============================================================
+ROOT = pathlib.Path(__file__).parent
+ARCHIVE_DIRS = (
+    ROOT / "zhihu-data" / "zhihu_output" / "answers",
+    ROOT / "zhihu-data" / "zhihu_output_sundaoshi" / "answers",
+    ROOT / "zhihu-data" / "zhihu_output_sundaoshi" / "articles",
+    ROOT / "articles",
+)
+SEARCH_DB = ROOT / ".cache" / "zhihu_search.sqlite3"
+TITLE_WEIGHT = 5.0   # bm25 中标题列相对正文的权重
+SNIPPET_CHARS = 80   # 摘要长度（字）
+# 抓取存档：每个目录下有 answers/、articles/ 和汇总用的 index.md
+ARCHIVES = (
+    ROOT / "zhihu-data" / "zhihu_output",
+    ROOT / "zhihu-data" / "zhihu_output_sundaoshi",
+)
+META_TABLE = ROOT / ".cache" / ("zhihu_meta.parquet" if pa is not None else "zhihu_meta.csv")
+META_COLUMNS = ("archive", "kind", "file", "title", "date", "votes", "comments", "url", "mtime", "size")
+HEADER_CHUNK = 1024        # 头部按块读取，一般一块就能读到 ---
+HEADER_MAX_BYTES = 8192    # 找不到 --- 时最多读这么多，不会把正文整个读进来
+META_WORKERS = 8
+
+
+# ============================================================
+# 切分
+# ============================================================
+_TOKEN_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[0-9A-Za-z]+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _is_cjk(run):
+    return run[0] >= "\u3400"
+
+
+def segment(text):
+    """中文连续段切成重叠二元组（单字段保留单字），字母数字按整词；
+    结果用空格分隔，交给 FTS5 的 unicode61 分词器（它会顺带做大小写折叠）"""
+    out = []
+    for run in _TOKEN_RE.findall(text):
+        if len(run) > 1 and _is_cjk(run):
+            out.append(" ".join(map(operator.add, run, run[1:])))
+        else:
+            out.append(run)
+    return " ".join(out)
+
+
+def _match_expr(query):
+    """查询串 -> FTS5 MATCH 表达式：每个中文段是二元组短语（相邻位置即原文连续），各段之间为 AND。
+    单个汉字只能按前缀匹配以它开头的二元组"""
+    terms = []
+    for run in _TOKEN_RE.findall(query):
+        if _is_cjk(run) and len(run) == 1:
+            terms.append(f"{run}*")
+        else:
+            terms.append(f'"{segment(run)}"')
+    return " AND ".join(terms)
+
+
+# ============================================================
+# 索引
+# ============================================================
+def open_index(db_path=SEARCH_DB):
+    db_path = pathlib.Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS docs (id INTEGER PRIMARY KEY, path TEXT UNIQUE, mtime REAL, "
+        "size INTEGER, source TEXT, title TEXT)"
+    )
+    # prefix='1'：单字查询走前缀索引，不必展开以该字开头的所有二元组
+    conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(title, body, prefix='1')")
+    return conn
+
+
+def _source_label(root):
+    try:
+        return root.relative_to(ROOT).as_posix()
+    except ValueError:
+        return str(root)
+
+
+def _title(text, path):
+    first = text.lstrip().split("\n", 1)[0]
+    return first[2:].strip() if first.startswith("# ") else path.stem
+
+
+def scan_archive(roots=ARCHIVE_DIRS):
+    """{路径: (mtime, size, 来源)}；各目录下的 index.md 是汇总列表，不收录"""
+    files = {}
+    for root in roots:
+        label = _source_label(root)
+        for path in root.glob("*.md"):
+            if path.name == "index.md":
+                continue
+            stat = path.stat()
+            files[str(path)] = (stat.st_mtime, stat.st_size, label)
+    return files
+
+
+def update_index(db_path=SEARCH_DB, roots=ARCHIVE_DIRS):
+    """增量更新：只对新增或 (mtime, size) 变了的文件重新切分入库，删掉已不存在的文件。
+    返回 {"indexed", "removed", "total", "seconds"}"""
+    started = time.perf_counter()
+    files = scan_archive(roots)
+    conn = open_index(db_path)
+    with conn:
+        known = {path: (doc_id, mtime, size) for doc_id, path, mtime, size in conn.execute(
+            "SELECT id, path, mtime, size FROM docs"
+        )}
+        stale = [
+            (doc_id,) for path, (doc_id, mtime, size) in known.items()
+            if files.get(path, (None, None))[:2] != (mtime, size)
+        ]
+        conn.executemany("DELETE FROM docs WHERE id = ?", stale)
+        conn.executemany("DELETE FROM docs_fts WHERE rowid = ?", stale)
+        fresh = [path for path, meta in files.items() if path not in known or known[path][1:] != meta[:2]]
+        for path in fresh:
+            mtime, size, source = files[path]
+            text = pathlib.Path(path).read_text(encoding="utf-8", errors="replace")
+            title = _title(text, pathlib.Path(path))
+            doc_id = conn.execute(
+                "INSERT INTO docs (path, mtime, size, source, title) VALUES (?, ?, ?, ?, ?)",
+                (path, mtime, size, source, title),
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO docs_fts (rowid, title, body) VALUES (?, ?, ?)",
+                (doc_id, segment(title), segment(text)),
+            )
+    conn.close()
+    return {
+        "indexed": len(fresh),
+        "removed": sum(1 for path in known if path not in files),
+        "total": len(files),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+# ============================================================
+# 查询
+# ============================================================
+def _snippet(text, words):
+    """正文里第一个命中词前后截取一段，命中词用 <mark> 标出（已转义，可直接作 HTML）"""
+    body = text.split("\n---\n", 1)[-1]
+    flat = _SPACE_RE.sub(" ", body).strip()
+    lower = flat.lower()
+    hits = [i for i in (lower.find(w) for w in words) if i >= 0]
+    start = max(0, min(hits) - SNIPPET_CHARS // 4) if hits else 0
+    piece = flat[start:start + SNIPPET_CHARS]
+    # 在原文上一次性找出所有命中（长词优先），分段转义后只给命中段包 <mark>，
+    # 避免命中 &lt; 这类实体或前一个词插入的标签
+    out, pos = [], 0
+    words = sorted(set(filter(None, words)), key=len, reverse=True)
+    if words:
+        pattern = re.compile("|".join(map(re.escape, words)), re.I)
+        for m in pattern.finditer(piece):
+            out.append(html.escape(piece[pos:m.start()]))
+            out.append(f"<mark>{html.escape(m.group(0))}</mark>")
+            pos = m.end()
+    out.append(html.escape(piece[pos:]))
+    out = "".join(out)
+    return ("…" if start else "") + out + ("…" if start + SNIPPET_CHARS < len(flat) else "")
+
+
+def search(query, limit=20, db_path=SEARCH_DB):
+    """按 bm25 排序返回 [{"path", "source", "title", "score", "snippet"}, ...]。
+    排序在 FTS5 内完成，只读取命中前 limit 个文件生成摘要"""
+    expr = _match_expr(query)
+    if not expr:
+        return []
+    conn = open_index(db_path)
+    with conn:
+        ranked = conn.execute(
+            "SELECT rowid, rank FROM docs_fts WHERE docs_fts MATCH ? AND rank MATCH ? ORDER BY rank LIMIT ?",
+            (expr, f"bm25({TITLE_WEIGHT}, 1.0)", limit),
+        ).fetchall()
+        docs = {doc_id: rest for doc_id, *rest in conn.execute(
+            f"SELECT id, path, source, title FROM docs WHERE id IN ({','.join('?' * len(ranked))})",
+            [doc_id for doc_id, _ in ranked],
+        )} if ranked else {}
+    conn.close()
+
+    words = [w.lower() for w in _TOKEN_RE.findall(query)]
+    results = []
+    for doc_id, score in ranked:
+        path, source, title = docs[doc_id]
+        try:
+            text = pathlib.Path(path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            text = ""
+        results.append({
+            "path": path, "source": source, "title": title,
+            "score": -score, "snippet": _snippet(text, words),
+        })
+    return results
+
+
+# ============================================================
+# 元数据表
+# ============================================================
+_HEADER_FIELDS = {"日期": "date", "赞同": "votes", "评论": "comments", "链接": "url"}
+_KINDS = {"answers": "answer", "articles": "article"}
+
+
+def _count(value):
+    """赞同/评论数：支持 1,234、1.2万、3.4k 这类写法，解析不了记 0"""
+    value = value.replace(",", "").strip().lower()
+    scale = 1
+    if value.endswith("万"):
+        value, scale = value[:-1], 10000
+    elif value.endswith("k"):
+        value, scale = value[:-1], 1000
+    try:
+        return int(float(value) * scale)
+    except ValueError:
+        return 0
+
+
+def read_header(path):
+    """只读文件开头的头部块：# 标题，- 日期/赞同/评论/链接，遇到 --- 即停，不读正文"""
+    meta = {"title": "", "date": "", "votes": 0, "comments": 0, "url": ""}
+    with open(path, "rb") as f:
+        head = f.read(HEADER_CHUNK)
+        while b"\n---" not in head and len(head) < HEADER_MAX_BYTES:
+            chunk = f.read(HEADER_CHUNK)
+            if not chunk:
+                break
+            head += chunk
+    head = head.split(b"\n---", 1)[0].decode("utf-8", errors="replace")
+    for line in head.splitlines():
+        line = line.strip()
+        if line.startswith("# ") and not meta["title"]:
+            meta["title"] = line[2:].strip()
+        elif line.startswith("- "):
+            key, _, value = line[2:].partition(":")
+            field = _HEADER_FIELDS.get(key.strip())
+            if field:
+                meta[field] = value.strip()
+    meta["votes"] = _count(str(meta["votes"]))
+    meta["comments"] = _count(str(meta["comments"]))
+    return meta
+
+
+def _load_table(table_path):
+    """列式表 -> {文件: 行}；表不存在或读不了时为空"""
+    table_path = pathlib.Path(table_path)
+    if not table_path.exists():
+        return {}
+    try:
+        if table_path.suffix == ".parquet" and pq is not None:
+            columns = pq.ParquetFile(table_path).read().to_pydict()
+            rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        else:
+            with open(table_path, encoding="utf-8", newline="") as f:
+                rows = list(csv.DictReader(f))
+            for row in rows:
+                for key in ("votes", "comments", "size"):
+                    row[key] = int(row[key])
+                row["mtime"] = float(row["mtime"])
+    except (OSError, ValueError, KeyError):
+        return {}
+    return {row["file"]: row for row in rows}
+
+
+def _write_table(columns, table_path):
+    table_path = pathlib.Path(table_path)
+    table_path.parent.mkdir(parents=True, exist_ok=True)
+    if table_path.suffix == ".parquet" and pa is not None:
+        pq.write_table(pa.table(columns), table_path)
+        return
+    with open(table_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(META_COLUMNS)
+        writer.writerows(zip(*(columns[c] for c in META_COLUMNS)))
+
+
+def collect_metadata(archives=ARCHIVES, table_path=META_TABLE, workers=META_WORKERS):
+    """刷新元数据表：只对新增或 (mtime, size) 变了的文件并行读头部，其余沿用上次的行。
+
+    返回 {"columns": {列名: [...]}（按存档、类型、文件名排序）, "digest": 内容哈希,
+          "read": 本次读了头部的文件数, "total", "seconds"}
+    """
+    started = time.perf_counter()
+    files = []
+    for archive in archives:
+        for folder, kind in _KINDS.items():
+            for path in (archive / folder).glob("*.md"):
+                stat = path.stat()
+                files.append((archive.name, kind, path, stat.st_mtime, stat.st_size))
+    files.sort(key=lambda f: (f[0], f[1], f[2].name))
+
+    previous = _load_table(table_path)
+    rows, pending = [], []
+    for archive, kind, path, mtime, size in files:
+        name = str(path.relative_to(ROOT)) if path.is_relative_to(ROOT) else str(path)
+        row = previous.get(name)
+        if row is None or (row["mtime"], row["size"]) != (mtime, size):
+            row = {"archive": archive, "kind": kind, "file": name, "mtime": mtime, "size": size}
+            pending.append((row, path))
+        rows.append(row)
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for (row, _), meta in zip(pending, pool.map(read_header, [path for _, path in pending])):
+                row.update(meta)
+
+    columns = {c: [row[c] for row in rows] for c in META_COLUMNS}
+    digest = hashlib.sha1(repr([(r["file"], r["mtime"], r["size"]) for r in rows]).encode()).hexdigest()
+    if pending or len(rows) != len(previous):
+        _write_table(columns, table_path)
+    return {
+        "columns": columns,
+        "digest": digest,
+        "read": len(pending),
+        "total": len(rows),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+_URL_ID_RE = re.compile(r"/(\d+)/?$")
+
+
+def render_index_md(columns, archive_dir):
+    """按元数据表重新生成一个存档的 index.md。
+    博主链接、抓取时间等表里没有的头部信息沿用旧 index.md，篇数按当前文件重算；
+    每节按日期、再按回答/文章 ID 从新到旧排列（与爬虫生成的 index.md 一致），完全相同的按文件名"""
+    archive_dir = pathlib.Path(archive_dir)
+    rows = {"article": [], "answer": []}
+    for archive, kind, file, title, date, votes, url in zip(
+        columns["archive"], columns["kind"], columns["file"], columns["title"],
+        columns["date"], columns["votes"], columns["url"],
+    ):
+        if archive == archive_dir.name:
+            item_id = _URL_ID_RE.search(url or "")
+            rows[kind].append((file, (date, int(item_id.group(1)) if item_id else 0),
+                               f"- [{title}]({url}) ({date}, {votes}赞)"))
+    entries = {}
+    for kind, items in rows.items():
+        items.sort(key=lambda r: r[0])
+        items.sort(key=lambda r: r[1], reverse=True)  # 稳定排序：重复抓取的同一条保持文件名顺序
+        entries[kind] = [line for _, _, line in items]
+
+    heading, preamble = "# 知乎博主内容汇总", []
+    old = archive_dir / "index.md"
+    if old.exists():
+        lines = old.read_text(encoding="utf-8").split("\n")
+        heading = lines[0] or heading
+        for line in lines[1:]:
+            if line.startswith("## "):
+                break
+            if line.startswith("- ") and not line.startswith(("- 文章数", "- 回答数")):
+                preamble.append(line)
+    out = [heading, "", *preamble]
+    out.append(f"- 文章数: {len(entries['article'])}")
+    out.append(f"- 回答数: {len(entries['answer'])}")
+    out += ["", "## 文章", "", *entries["article"], "", "## 回答", "", *entries["answer"], ""]
+    return "\n".join(out)
+
+
+# ============================================================
+# 命令行
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="知乎存档全文检索")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("index", help="增量更新索引")
+    p_search = sub.add_parser("search", help="检索")
+    p_search.add_argument("query", nargs="+")
+    p_search.add_argument("--limit", type=int, default=10)
+    sub.add_parser("meta", help="刷新元数据表")
+    p_index_md = sub.add_parser("index-md", help="重新生成各存档的 index.md")
+    p_index_md.add_argument("--stdout", action="store_true", help="只打印，不写文件")
+    args = parser.parse_args()
+
+    if args.command in ("meta", "index-md"):
+        meta = collect_metadata()
+        print(f"元数据：读取头部 {meta['read']} 个，共 {meta['total']} 个文件，"
+              f"耗时 {meta['seconds'] * 1000:.0f} ms → {META_TABLE.name}")
+        columns = meta["columns"]
+        if args.command == "meta":
+            top = sorted(range(meta["total"]), key=lambda i: -columns["votes"][i])[:20]
+            for i in top:
+                print(f"{columns['votes'][i]:>6} 赞 {columns['comments'][i]:>5} 评  "
+                      f"{columns['date'][i]}  {columns['title'][i]}")
+            return
+        for archive in ARCHIVES:
+            text = render_index_md(columns, archive)
+            if args.stdout:
+                print(text, end="")
+            else:
+                (archive / "index.md").write_text(text, encoding="utf-8")
+                print(f"已生成 {archive / 'index.md'}")
+        return
+
+    stats = update_index()
+    print(f"索引：新增/更新 {stats['indexed']} 个，删除 {stats['removed']} 个，"
+          f"共 {stats['total']} 个文件，耗时 {stats['seconds'] * 1000:.0f} ms")
+    if args.command == "search":
+        started = time.perf_counter()
+        results = search(" ".join(args.query), limit=args.limit)
+        print(f"命中 {len(results)} 条，耗时 {(time.perf_counter() - started) * 1000:.1f} ms\n")
+        for i, r in enumerate(results, 1):
+            snippet = re.sub(r"</?mark>", "", html.unescape(r["snippet"]))
+            print(f"{i}. [{r['source']}] {r['title']}  ({r['score']:.2f})")
+            print(f"   {snippet}\n")
+
+
+if __name__ == "__main__":
+    main()